@@ -30,7 +30,8 @@ engine = create_engine(
     pool_size=10,  # Number of connections to keep open
     max_overflow=20,  # Maximum number of connections to create beyond pool_size
     pool_timeout=30,  # Seconds to wait before giving up on getting a connection from the pool
-    pool_recycle=1800  # Seconds after which a connection is recycled (30 minutes)
+    pool_recycle=1800,  # Seconds after which a connection is recycled (30 minutes)
+    pool_pre_ping=True  # Replace pooled connections dropped by the server instead of failing on them
 )
 
 # Create session factory
@@ -81,4 +82,10 @@ def init_db():
     
     # Create all tables
     Base.metadata.create_all(bind=engine)
+    
+    # create_all skips tables that already exist, so add the indexes declared
+    # since those tables were created
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(bind=engine, checkfirst=True)
     logger.info("Database tables created")
@@ -2,8 +2,8 @@
 Product model for the application.
 """
 import enum
-from sqlalchemy import Column, Integer, String, Float, ForeignKey, Table, DateTime, Boolean, Enum, Text
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, String, Float, ForeignKey, Table, DateTime, Boolean, Enum, Text, cast, literal
+from sqlalchemy.orm import relationship, column_property
 import datetime
 
 from database.base import Base
@@ -53,6 +53,9 @@ class Product(Base):
     production_cost = Column(Float, nullable=False)  # in currency units
     initial_quantity = Column(Integer, default=0)
     
+    # Placeholder SKU derived from the id, computed by the database with the row
+    sku = column_property(literal("SKU-") + cast(id, String))
+    
     # Relationships
     countries = relationship("Country", secondary=product_country, back_populates="products")
     sales = relationship("Sale", back_populates="product")
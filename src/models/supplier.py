@@ -1,8 +1,7 @@
 """
 Supplier model for the application.
 """
-import datetime
-from sqlalchemy import Column, Integer, String, DateTime, Text
+from sqlalchemy import Column, Integer, String, DateTime, Text, func
 from sqlalchemy.orm import relationship
 
 from database.base import Base
@@ -27,8 +26,10 @@ class Supplier(Base):
     country = Column(String(50), nullable=True)
     website = Column(String(100), nullable=True)
     notes = Column(Text, nullable=True)
-    created_at = Column(DateTime, default=datetime.datetime.utcnow, nullable=False)
-    updated_at = Column(DateTime, default=datetime.datetime.utcnow, nullable=False)
+    # Timestamps are computed by the database: default covers tables created before the
+    # server defaults existed, server_default covers new ones
+    created_at = Column(DateTime, default=func.now(), server_default=func.now(), nullable=False)
+    updated_at = Column(DateTime, default=func.now(), server_default=func.now(), onupdate=func.now(), nullable=False)
     
     # Relationships
     emails = relationship("SupplierEmail", back_populates="supplier", cascade="all, delete-orphan")
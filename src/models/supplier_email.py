@@ -16,12 +16,12 @@ class SupplierEmail(Base):
     __tablename__ = "supplier_emails"
     
     id = Column(Integer, primary_key=True, index=True)
-    supplier_id = Column(Integer, ForeignKey("suppliers.id"), nullable=False)
+    supplier_id = Column(Integer, ForeignKey("suppliers.id", ondelete="CASCADE"), nullable=False)
     subject = Column(String(255), nullable=False)
     body = Column(Text, nullable=False)
     is_incoming = Column(Boolean, default=False, nullable=False)
     status = Column(Enum(EmailStatus), default=EmailStatus.UNREAD, nullable=False)
-    received_at = Column(DateTime, nullable=False)
+    received_at = Column(DateTime, nullable=False, index=True)
     created_at = Column(DateTime, default=datetime.datetime.utcnow, nullable=False)
     updated_at = Column(DateTime, default=datetime.datetime.utcnow, nullable=False)
     
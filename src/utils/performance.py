@@ -84,6 +84,54 @@ def clear_cache() -> None:
         _memory_cache["expiry"].clear()
     logging.debug("Cache en mémoire vidé")
 
+class QueryCache:
+    """
+    Cache en mémoire des résultats de requêtes, avec expiration et invalidation explicite.
+    """
+    def __init__(self, expiry_seconds: int = 30):
+        self.expiry_seconds = expiry_seconds
+        # Clé (tuple dont le premier élément nomme la table) -> (expiration, résultat)
+        self._entries: Dict[tuple, tuple] = {}
+        self._lock = threading.RLock()
+    
+    def get(self, key: tuple, loader: Callable, expiry_seconds: Optional[int] = None) -> Any:
+        """
+        Retourner le résultat en cache pour une clé, ou l'obtenir via le chargeur.
+        
+        Args:
+            key: Clé de la requête, par exemple ("products", "by_name").
+            loader: Fonction exécutant la requête si le cache est vide ou expiré.
+            expiry_seconds: Durée de validité propre à cette entrée.
+            
+        Returns:
+            Le résultat de la requête.
+        """
+        with self._lock:
+            current_time = time.time()
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > current_time:
+                return entry[1]
+            
+            result = loader()
+            if expiry_seconds is None:
+                expiry_seconds = self.expiry_seconds
+            self._entries[key] = (current_time + expiry_seconds, result)
+            return result
+    
+    def invalidate(self, name: Optional[str] = None) -> None:
+        """
+        Invalider les entrées d'une table, ou tout le cache.
+        
+        Args:
+            name: Premier élément des clés à invalider, ou None pour tout vider.
+        """
+        with self._lock:
+            if name is None:
+                self._entries.clear()
+            else:
+                for key in [key for key in self._entries if key[0] == name]:
+                    del self._entries[key]
+
 def run_in_thread(func: Callable) -> Callable:
     """
     Décorateur pour exécuter une fonction dans un thread séparé.
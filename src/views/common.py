@@ -0,0 +1,190 @@
+"""
+Helpers shared by the views of the application.
+"""
+import functools
+from PySide6.QtWidgets import (
+    QDialog, QStyledItemDelegate, QApplication, QStyle, QStyleOptionButton, QToolTip
+)
+from PySide6.QtCore import Qt, QSize, QRect, QEvent, QTimer
+from PySide6.QtGui import QIcon, QPainter
+
+
+# Stylesheet of the "×" button closing a frameless dialog's title bar
+CLOSE_BUTTON_STYLESHEET = """
+QPushButton {
+    background-color: transparent;
+    color: #94A3B8;
+    font-size: 20px;
+    font-weight: bold;
+    border: none;
+    border-radius: 15px;
+}
+QPushButton:hover {
+    background-color: #EF4444;
+    color: #F8FAFC;
+}
+"""
+
+
+@functools.lru_cache(maxsize=None)
+def cached_icon(path):
+    """Return the icon at the given path, read and decoded once per path."""
+    return QIcon(path)
+
+
+@functools.lru_cache(maxsize=None)
+def cached_pixmap(path, size):
+    """Return the icon at the given path rasterized at size x size pixels, once per path and size."""
+    return cached_icon(path).pixmap(QSize(size, size))
+
+
+class DraggableDialog(QDialog):
+    """Frameless, slightly transparent dialog that can be dragged by its body."""
+    # Opacity of the whole window; subclasses set 1.0 to render opaque
+    WINDOW_OPACITY = 0.9
+    
+    def __init__(self, parent=None):
+        # For window dragging
+        self.dragging = False
+        self.drag_position = None
+        
+        super().__init__(parent)
+        
+        # Remove window frame and title bar
+        self.setWindowFlags(Qt.Dialog | Qt.FramelessWindowHint)
+        if self.WINDOW_OPACITY < 1.0:
+            self.setWindowOpacity(self.WINDOW_OPACITY)
+        
+        # Move the window at most once per frame (~60 Hz), to the latest position
+        self.pending_position = None
+        self.move_timer = QTimer(self)
+        self.move_timer.setSingleShot(True)
+        self.move_timer.setInterval(16)
+        self.move_timer.timeout.connect(self.apply_pending_move)
+    
+    def mousePressEvent(self, event):
+        """Handle mouse press event for window dragging."""
+        if event.button() == Qt.LeftButton:
+            self.dragging = True
+            self.drag_position = event.globalPosition().toPoint() - self.frameGeometry().topLeft()
+            event.accept()
+    
+    def mouseMoveEvent(self, event):
+        """Handle mouse move event for window dragging."""
+        if event.buttons() & Qt.LeftButton and self.dragging:
+            self.pending_position = event.globalPosition().toPoint() - self.drag_position
+            if not self.move_timer.isActive():
+                self.move_timer.start()
+            event.accept()
+    
+    def mouseReleaseEvent(self, event):
+        """Handle mouse release event for window dragging."""
+        if event.button() == Qt.LeftButton:
+            self.dragging = False
+            # Land on the final position without waiting for the timer
+            self.move_timer.stop()
+            self.apply_pending_move()
+            event.accept()
+    
+    def apply_pending_move(self):
+        """Move the window to the last position requested by the drag."""
+        if self.pending_position is not None:
+            self.move(self.pending_position)
+            self.pending_position = None
+
+
+class IconButtonsDelegate(QStyledItemDelegate):
+    """
+    Delegate painting a row of icon buttons in a table cell and handling their clicks.
+    
+    Each button is an (icon path, tooltip, callback) tuple; a click calls the button's
+    callback with the ID stored in the cell's Qt.UserRole. No widget is created per row.
+    """
+    def __init__(self, buttons, parent=None, button_size=30, icon_size=16, spacing=4,
+                 button_color=None):
+        """
+        Args:
+            buttons: (icon path, tooltip, callback) of each button, in display order.
+            parent: Parent object, usually the table view.
+            button_size: Side of each square button, in pixels.
+            icon_size: Side of the icon drawn in each button, in pixels.
+            spacing: Space around and between the buttons, in pixels.
+            button_color: Fill of rounded flat buttons, or None for the style's push buttons.
+        """
+        super().__init__(parent)
+        
+        self.buttons = tuple(buttons)
+        self.button_size = button_size
+        self.icon_size = icon_size
+        self.spacing = spacing
+        self.button_color = button_color
+    
+    def cell_width(self):
+        """Return the width taken by the buttons and their spacing."""
+        count = len(self.buttons)
+        return (count + 1) * self.spacing + count * self.button_size
+    
+    def button_rects(self, rect):
+        """Return the rectangle of each button inside a cell."""
+        size = self.button_size
+        top = rect.top() + (rect.height() - size) // 2
+        return [
+            QRect(rect.left() + self.spacing + i * (size + self.spacing), top, size, size)
+            for i in range(len(self.buttons))
+        ]
+    
+    def button_at(self, rect, position):
+        """Return the index of the button under a position, or None."""
+        for i, button_rect in enumerate(self.button_rects(rect)):
+            if button_rect.contains(position):
+                return i
+        return None
+    
+    def paint(self, painter, option, index):
+        """Draw the cell background, then the buttons."""
+        super().paint(painter, option, index)
+        
+        rects = self.button_rects(option.rect)
+        if self.button_color is None:
+            style = QApplication.style()
+            button_option = QStyleOptionButton()
+            button_option.state = QStyle.State_Enabled | QStyle.State_Raised
+            button_option.iconSize = QSize(self.icon_size, self.icon_size)
+            for (icon_path, _, _), button_rect in zip(self.buttons, rects):
+                button_option.rect = button_rect
+                button_option.icon = cached_icon(icon_path)
+                style.drawControl(QStyle.CE_PushButton, button_option, painter)
+            return
+        
+        painter.save()
+        painter.setRenderHint(QPainter.Antialiasing)
+        painter.setPen(Qt.NoPen)
+        painter.setBrush(self.button_color)
+        offset = (self.button_size - self.icon_size) // 2
+        for (icon_path, _, _), button_rect in zip(self.buttons, rects):
+            painter.drawRoundedRect(button_rect, 15, 15)
+            icon_rect = button_rect.adjusted(offset, offset, -offset, -offset)
+            painter.drawPixmap(icon_rect, cached_pixmap(icon_path, self.icon_size))
+        painter.restore()
+    
+    def editorEvent(self, event, model, option, index):
+        """Call the clicked button's callback with the ID stored in Qt.UserRole."""
+        if event.type() == QEvent.MouseButtonRelease and event.button() == Qt.LeftButton:
+            button = self.button_at(option.rect, event.position().toPoint())
+            if button is not None:
+                self.buttons[button][2](index.data(Qt.UserRole))
+                return True
+        return super().editorEvent(event, model, option, index)
+    
+    def helpEvent(self, event, view, option, index):
+        """Show the tooltip of the button under the mouse."""
+        if event.type() == QEvent.ToolTip:
+            button = self.button_at(option.rect, event.pos())
+            if button is not None:
+                QToolTip.showText(event.globalPos(), self.buttons[button][1], view)
+                return True
+        return super().helpEvent(event, view, option, index)
+    
+    def sizeHint(self, option, index):
+        """Reserve room for the buttons."""
+        return QSize(self.cell_width(), self.button_size + 2 * self.spacing)
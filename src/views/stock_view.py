@@ -1,44 +1,494 @@
 """
 Stock view for the application.
 """
-import os
-import sys
 import logging
 import csv
 import json
+import re
+import functools
+import importlib
+import operator
+from collections import defaultdict
+from itertools import repeat
+import numpy as np
 from PySide6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, 
     QFrame, QGridLayout, QScrollArea, QTabWidget, QLineEdit,
-    QTableWidget, QTableWidgetItem, QHeaderView, QComboBox,
-    QSpinBox, QDoubleSpinBox, QMessageBox, QDialog, QFormLayout,
+    QTableView, QAbstractItemView, QHeaderView, QComboBox,
+    QSpinBox, QDoubleSpinBox, QMessageBox, QFormLayout,
     QFileDialog
 )
-from PySide6.QtCore import Qt, Signal, QSize
-from PySide6.QtGui import QIcon, QFont, QColor, QPainter
-
-# Add the parent directory to sys.path to allow imports
-sys.path.insert(0, os.path.abspath(os.path.dirname(__file__) + '/../..'))
+from PySide6.QtCore import (
+    Qt, Signal, QSize, QSortFilterProxyModel, QTimer, QAbstractTableModel,
+    QModelIndex, QObject, QRunnable, QThreadPool
+)
+from PySide6.QtGui import QFont, QColor, QPainter
 
 from models.product import Product
 from models.raw_material import RawMaterial
+from utils.performance import QueryCache
+from views.common import CLOSE_BUTTON_STYLESHEET, DraggableDialog, IconButtonsDelegate, cached_icon
+
+
+# Column headers shared by the tables and the exports
+PRODUCT_HEADERS = ("ID", "Nom", "SKU", "Catégorie", "Prix", "Quantité", "Seuil")
+MATERIAL_HEADERS = ("ID", "Nom", "Référence", "Type", "Unité", "Coût", "Quantité", "Seuil")
+PRODUCT_EXPORT_HEADERS = PRODUCT_HEADERS + ("Description",)
+MATERIAL_EXPORT_HEADERS = MATERIAL_HEADERS + ("Fournisseur",)
+
+# Columns read for the tables and the exports; the rows come back as lightweight named
+# tuples, without ORM objects, identity map entries or change tracking
+PRODUCT_COLUMNS = (
+    Product.id, Product.name, Product.sku, Product.production_cost, Product.initial_quantity,
+    Product.description
+)
+MATERIAL_COLUMNS = (
+    RawMaterial.id, RawMaterial.name, RawMaterial.reference_code, RawMaterial.type,
+    RawMaterial.unit, RawMaterial.cost, RawMaterial.quantity, RawMaterial.reorder_level,
+    RawMaterial.supplier
+)
+
+# Choices offered by the dialogs
+PRODUCT_CATEGORIES = ("Figurine", "Maquette", "Accessoire", "Autre")
+MATERIAL_TYPES = ("Résine", "Plastique", "Métal", "Peinture", "Autre")
+MATERIAL_UNITS = ("kg", "g", "l", "ml", "unité", "m", "cm")
+EXPORT_FORMATS = ("CSV (.csv)", "Excel (.xlsx)", "PDF (.pdf)", "JSON (.json)")
+# File dialog filter of each export format
+EXPORT_FILE_FILTERS = {
+    "CSV (.csv)": "Fichiers CSV (*.csv)",
+    "Excel (.xlsx)": "Fichiers Excel (*.xlsx)",
+    "PDF (.pdf)": "Fichiers PDF (*.pdf)",
+    "JSON (.json)": "Fichiers JSON (*.json)",
+}
+
+# Stylesheet shared by the stock dialogs
+DIALOG_STYLESHEET = """
+QDialog {
+    background-color: #0F172A;
+}
+QLabel {
+    color: #94A3B8;
+}
+QLineEdit, QComboBox, QSpinBox, QDoubleSpinBox {
+    background-color: #334155;
+    color: #F8FAFC;
+    border: 1px solid #475569;
+    border-radius: 12px;
+    padding: 8px;
+}
+QLineEdit:focus, QComboBox:focus, QSpinBox:focus, QDoubleSpinBox:focus {
+    border: 1px solid #3B82F6;
+}
+QPushButton {
+    background-color: #3B82F6;
+    color: #F8FAFC;
+    border: none;
+    border-radius: 12px;
+    padding: 8px 16px;
+    font-weight: bold;
+}
+QPushButton:hover {
+    background-color: #2563EB;
+}
+QPushButton:pressed {
+    background-color: #1D4ED8;
+}
+QPushButton#cancelBtn {
+    background-color: #475569;
+}
+QPushButton#cancelBtn:hover {
+    background-color: #64748B;
+}
+QPushButton#secondaryBtn {
+    background-color: #334155;
+    font-weight: normal;
+}
+QPushButton#secondaryBtn:hover {
+    background-color: #475569;
+}
+QPushButton#inlineBtn {
+    background-color: #0F172A;
+    border: 1px solid #1E293B;
+    border-radius: 4px;
+    padding: 4px 8px;
+    text-align: left;
+    font-weight: normal;
+}
+QPushButton#inlineBtn:hover {
+    background-color: #1E293B;
+}
+"""
+
+# Stylesheet of the notification shown after a successful change
+TOAST_STYLESHEET = """
+QLabel {
+    background-color: #10B981;
+    color: #F8FAFC;
+    border-radius: 12px;
+    padding: 10px 16px;
+    font-weight: bold;
+}
+"""
+
+
+@functools.lru_cache(maxsize=None)
+def optional_module(name):
+    """Import an optional export dependency on first use; return None if it is missing."""
+    try:
+        return importlib.import_module(name)
+    except ImportError:
+        return None
+
+
+@functools.lru_cache(maxsize=None)
+def product_details_dialog_class():
+    """Import the product details dialog on first use and return its class."""
+    from views.product_details_dialog import ProductDetailsDialog
+    return ProductDetailsDialog
+
+
+class StockTableModel(QAbstractTableModel):
+    """Table model over stock rows stored as tuples, followed by an actions column."""
+    def __init__(self, headers, parent=None):
+        super().__init__(parent)
+        
+        self.headers = headers
+        self.actions_column = len(headers)
+        # One tuple of raw values per row, the row id first
+        self.rows = []
+        # The same rows formatted once for display, so painting does no formatting
+        self.display_rows = []
+        # Position of each row, by row id
+        self.positions = {}
+    
+    @staticmethod
+    def display_text(value):
+        """Format a raw cell value for display."""
+        return "" if value is None else str(value)
+    
+    @classmethod
+    def display_row(cls, row):
+        """Format every value of a row for display."""
+        return tuple(map(cls.display_text, row))
+    
+    def rowCount(self, parent=QModelIndex()):
+        """Return the number of rows."""
+        return 0 if parent.isValid() else len(self.rows)
+    
+    def columnCount(self, parent=QModelIndex()):
+        """Return the number of columns, including the actions column."""
+        return 0 if parent.isValid() else len(self.headers) + 1
+    
+    def data(self, index, role=Qt.DisplayRole):
+        """Return the display text, or the raw value for Qt.UserRole."""
+        if not index.isValid():
+            return None
+        
+        row = self.rows[index.row()]
+        column = index.column()
+        
+        if column == self.actions_column:
+            # The actions column carries the row id for its buttons
+            return row[0] if role == Qt.UserRole else None
+        
+        if role == Qt.DisplayRole:
+            return self.display_rows[index.row()][column]
+        if role == Qt.UserRole:
+            # Raw values let the proxy sort numbers numerically
+            value = row[column]
+            return "" if value is None else value
+        return None
+    
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        """Return the column titles."""
+        if role != Qt.DisplayRole or orientation != Qt.Horizontal:
+            return None
+        return self.headers[section] if section < self.actions_column else "Actions"
+    
+    def set_rows(self, rows):
+        """Replace all the rows."""
+        self.beginResetModel()
+        self.rows = rows
+        self.display_rows = list(map(self.display_row, rows))
+        self.positions = {row[0]: position for position, row in enumerate(rows)}
+        self.endResetModel()
+    
+    def append_row(self, row):
+        """Append a single row."""
+        position = len(self.rows)
+        self.beginInsertRows(QModelIndex(), position, position)
+        self.rows.append(row)
+        self.display_rows.append(self.display_row(row))
+        self.positions[row[0]] = position
+        self.endInsertRows()
+    
+    def row_position(self, row_id):
+        """Return the position of the row with the given id, or None if it is not loaded."""
+        return self.positions.get(row_id)
+    
+    def replace_row(self, position, row):
+        """Replace the values of a single row."""
+        self.rows[position] = row
+        self.display_rows[position] = self.display_row(row)
+        self.dataChanged.emit(self.index(position, 0), self.index(position, self.actions_column))
+    
+    def remove_row(self, position):
+        """Remove a single row."""
+        self.beginRemoveRows(QModelIndex(), position, position)
+        del self.positions[self.rows[position][0]]
+        del self.rows[position]
+        del self.display_rows[position]
+        # The following rows move up by one
+        positions = self.positions
+        for i in range(position, len(self.rows)):
+            positions[self.rows[i][0]] = i
+        self.endRemoveRows()
+
+
+class StockFilterProxy(QSortFilterProxyModel):
+    """Proxy model filtering stock rows on a substring of their searchable columns."""
+    def __init__(self, search_columns, code_columns=(), parent=None):
+        super().__init__(parent)
+        
+        # Low-cardinality columns are matched through integer codes, not the haystacks
+        self.code_columns = tuple(code_columns)
+        self.search_columns = [col for col in search_columns if col not in self.code_columns]
+        self.search_text = ""
+        self.needle = ""
+        self.regex_enabled = False
+        # Last compiled regular expression and the search text it was built from
+        self.pattern = None
+        self.pattern_text = None
+        # Lowercased searchable text of each source row, built once per load
+        self.haystacks = []
+        # Slots of the source rows containing each three-character sequence of their text;
+        # a slot identifies a row for good, so removing a row leaves the other postings intact
+        self.trigrams = defaultdict(set)
+        # Slot of each source row, the position of each slot, and the next unused slot
+        self.slots = []
+        self.slot_positions = {}
+        self.next_slot = 0
+        # Code of each distinct lowercased label, and the code of each row, per code column
+        self.code_lookups = [{} for _ in self.code_columns]
+        self.codes = [np.empty(0, dtype=np.int16) for _ in self.code_columns]
+        # Whether each source row contains the current search text
+        self.accepted = bytearray()
+        
+        self.setSortRole(Qt.UserRole)
+    
+    def build_haystack(self, row):
+        """Build the lowercased searchable text of a row of raw values."""
+        # Newlines keep a literal search from matching across two columns; a regular
+        # expression is matched on each column separately, see haystack_matcher()
+        display_text = StockTableModel.display_text
+        return "\n".join(display_text(row[col]) for col in self.search_columns).lower()
+    
+    def code_label(self, row, column):
+        """Return the lowercased label a code column is matched on."""
+        return StockTableModel.display_text(row[column]).lower()
+    
+    def set_source_rows(self, rows):
+        """Index the rows about to be set on the source model, in source order."""
+        self.haystacks = [self.build_haystack(row) for row in rows]
+        self.index_all_trigrams()
+        
+        code_label = self.code_label
+        for i, column in enumerate(self.code_columns):
+            lookup = self.code_lookups[i] = {}
+            assign = lookup.setdefault
+            self.codes[i] = np.fromiter(
+                (assign(code_label(row, column), len(lookup)) for row in rows),
+                dtype=np.int16, count=len(rows)
+            )
+        
+        self.accepted = self.match_rows()
+    
+    def index_all_trigrams(self):
+        """Rebuild the trigram index from the haystacks, one slot per row."""
+        self.trigrams = defaultdict(set)
+        self.slots = list(range(len(self.haystacks)))
+        self.slot_positions = dict(zip(self.slots, self.slots))
+        self.next_slot = len(self.slots)
+        index_trigrams = self.index_trigrams
+        for slot, haystack in enumerate(self.haystacks):
+            index_trigrams(slot, haystack)
+    
+    @staticmethod
+    def haystack_trigrams(haystack):
+        """Return the distinct three-character sequences of a text."""
+        return {haystack[i:i + 3] for i in range(len(haystack) - 2)}
+    
+    def index_trigrams(self, slot, haystack):
+        """Record the row's slot under every three-character sequence of its text."""
+        trigrams = self.trigrams
+        for trigram in self.haystack_trigrams(haystack):
+            trigrams[trigram].add(slot)
+    
+    def unindex_trigrams(self, slot, haystack):
+        """Drop the row's slot from the postings of every three-character sequence of its text."""
+        trigrams = self.trigrams
+        for trigram in self.haystack_trigrams(haystack):
+            postings = trigrams.get(trigram)
+            if postings is not None:
+                postings.discard(slot)
+                if not postings:
+                    del trigrams[trigram]
+    
+    def compile_pattern(self):
+        """Compile the search text as a case-insensitive regular expression."""
+        if self.pattern_text != self.search_text:
+            flags = re.IGNORECASE
+            try:
+                self.pattern = re.compile(self.search_text, flags)
+            except re.error:
+                # Incomplete expressions (while typing) match literally
+                self.pattern = re.compile(re.escape(self.search_text), flags)
+            self.pattern_text = self.search_text
+        return self.pattern
+    
+    def matcher(self):
+        """Return a callable telling whether a single text matches the search."""
+        if self.regex_enabled and self.search_text:
+            return self.compile_pattern().search
+        needle = self.needle
+        return lambda text: needle in text
+    
+    def haystack_matcher(self):
+        """Return a callable telling whether a row's haystack matches the search."""
+        if self.regex_enabled and self.search_text:
+            # \s, [^x] and the like match newlines, so each column is searched on its own
+            search = self.compile_pattern().search
+            return lambda haystack: any(map(search, haystack.split("\n")))
+        needle = self.needle
+        return lambda haystack: needle in haystack
+    
+    def match_rows(self):
+        """Return one byte per source row, set when the row matches the search."""
+        accepted = self.match_haystacks()
+        if not self.code_columns or all(accepted):
+            return accepted
+        
+        # Each distinct label is matched once, then its rows are selected by code in C
+        mask = np.frombuffer(accepted, dtype=np.uint8).astype(bool)
+        matches = self.matcher()
+        for lookup, codes in zip(self.code_lookups, self.codes):
+            matched = [code for label, code in lookup.items() if matches(label)]
+            if matched:
+                mask |= np.isin(codes, matched)
+        return bytearray(mask.tobytes())
+    
+    def match_haystacks(self):
+        """Return one byte per source row, set when its haystack matches the search."""
+        if self.regex_enabled and self.search_text:
+            return bytearray(map(self.haystack_matcher(), self.haystacks))
+        
+        needle = self.needle
+        if len(needle) < 3:
+            return bytearray(map(str.__contains__, self.haystacks, repeat(needle)))
+        
+        # Only rows holding every trigram of the needle can contain it
+        rows_with = self.trigrams.get
+        postings = sorted(
+            (rows_with(needle[i:i + 3], set()) for i in range(len(needle) - 2)),
+            key=len
+        )
+        candidates = postings[0].intersection(*postings[1:])
+        
+        accepted = bytearray(len(self.haystacks))
+        haystacks = self.haystacks
+        slot_positions = self.slot_positions
+        for slot in candidates:
+            row = slot_positions[slot]
+            if needle in haystacks[row]:
+                accepted[row] = 1
+        return accepted
+    
+    def append_source_row(self, row):
+        """Index a row about to be appended to the source model."""
+        haystack = self.build_haystack(row)
+        matches = self.matcher()
+        matched = self.haystack_matcher()(haystack)
+        
+        for i, column in enumerate(self.code_columns):
+            label = self.code_label(row, column)
+            lookup = self.code_lookups[i]
+            code = lookup.setdefault(label, len(lookup))
+            self.codes[i] = np.append(self.codes[i], np.int16(code))
+            matched = matched or bool(matches(label))
+        
+        slot = self.next_slot
+        self.next_slot += 1
+        self.slot_positions[slot] = len(self.slots)
+        self.slots.append(slot)
+        self.index_trigrams(slot, haystack)
+        self.haystacks.append(haystack)
+        self.accepted.append(matched)
+    
+    def replace_source_row(self, position, row):
+        """Re-index a source row about to be changed on the source model."""
+        haystack = self.build_haystack(row)
+        matches = self.matcher()
+        matched = self.haystack_matcher()(haystack)
+        
+        for i, column in enumerate(self.code_columns):
+            label = self.code_label(row, column)
+            lookup = self.code_lookups[i]
+            self.codes[i][position] = lookup.setdefault(label, len(lookup))
+            matched = matched or bool(matches(label))
+        
+        # Only the changed row's postings are updated
+        slot = self.slots[position]
+        self.unindex_trigrams(slot, self.haystacks[position])
+        self.index_trigrams(slot, haystack)
+        self.haystacks[position] = haystack
+        self.accepted[position] = matched
+    
+    def remove_source_row(self, position):
+        """Drop a source row about to be removed from the source model."""
+        slot = self.slots[position]
+        self.unindex_trigrams(slot, self.haystacks[position])
+        
+        del self.haystacks[position]
+        del self.accepted[position]
+        del self.slots[position]
+        del self.slot_positions[slot]
+        for i, codes in enumerate(self.codes):
+            self.codes[i] = np.delete(codes, position)
+        # The following rows move up by one; their slots, and so their postings, are unchanged
+        slot_positions = self.slot_positions
+        for i in range(position, len(self.slots)):
+            slot_positions[self.slots[i]] = i
+    
+    def set_filter_text(self, text):
+        """Set the search text and re-filter the rows if it changed."""
+        if text == self.search_text:
+            return
+        
+        self.search_text = text
+        self.needle = text.lower()
+        self.accepted = self.match_rows()
+        self.invalidateRowsFilter()
+    
+    def set_regex_enabled(self, enabled):
+        """Switch between literal and regular-expression search."""
+        self.regex_enabled = enabled
+        self.accepted = self.match_rows()
+        self.invalidateRowsFilter()
+    
+    def filterAcceptsRow(self, source_row, source_parent):
+        """Accept the row if one of the searchable columns matches the search."""
+        return bool(self.accepted[source_row])
 
 
-class AddProductDialog(QDialog):
+class AddProductDialog(DraggableDialog):
     """Dialog for adding a new finished product."""
     def __init__(self, db, parent=None):
-        # For window dragging
-        self.dragging = False
-        self.drag_position = None
-        
         super().__init__(parent)
         
         self.db = db
         self.production_data = None
         self.image_paths = []  # Liste des chemins d'images
         
-        # Remove window frame and title bar
-        self.setWindowFlags(Qt.Dialog | Qt.FramelessWindowHint)
-        self.setWindowOpacity(0.9)  # 10% transparency
         self.setMinimumWidth(500)
         
         # Main layout
@@ -58,20 +508,7 @@ class AddProductDialog(QDialog):
         close_btn = QPushButton("×")
         close_btn.setFixedSize(30, 30)
         close_btn.setCursor(Qt.PointingHandCursor)
-        close_btn.setStyleSheet("""
-            QPushButton {
-                background-color: transparent;
-                color: #94A3B8;
-                font-size: 20px;
-                font-weight: bold;
-                border: none;
-                border-radius: 15px;
-            }
-            QPushButton:hover {
-                background-color: #EF4444;
-                color: #F8FAFC;
-            }
-        """)
+        close_btn.setStyleSheet(CLOSE_BUTTON_STYLESHEET)
         close_btn.clicked.connect(self.reject)
         
         title_bar_layout.addWidget(title_label)
@@ -94,7 +531,7 @@ class AddProductDialog(QDialog):
         
         # Category
         self.category_input = QComboBox()
-        self.category_input.addItems(["Figurine", "Maquette", "Accessoire", "Autre"])
+        self.category_input.addItems(PRODUCT_CATEGORIES)
         self.category_input.setEditable(True)
         form_layout.addRow("Catégorie:", self.category_input)
         
@@ -107,21 +544,9 @@ class AddProductDialog(QDialog):
         
         # Details button
         details_btn = QPushButton("Détails")
-        details_btn.setIcon(QIcon("src/resources/icons/view.png"))
+        details_btn.setIcon(cached_icon("src/resources/icons/view.png"))
         details_btn.setCursor(Qt.PointingHandCursor)
-        details_btn.setStyleSheet("""
-            QPushButton {
-                background-color: #0F172A;
-                color: #F8FAFC;
-                border: 1px solid #1E293B;
-                border-radius: 4px;
-                padding: 4px 8px;
-                text-align: left;
-            }
-            QPushButton:hover {
-                background-color: #1E293B;
-            }
-        """)
+        details_btn.setObjectName("inlineBtn")
         details_btn.setIconSize(QSize(16, 16))
         details_btn.clicked.connect(self.show_details)
         
@@ -159,21 +584,9 @@ class AddProductDialog(QDialog):
         
         # Add image button
         add_image_btn = QPushButton("Ajouter des images")
-        add_image_btn.setIcon(QIcon("src/resources/icons/add.png"))
+        add_image_btn.setIcon(cached_icon("src/resources/icons/add.png"))
         add_image_btn.setCursor(Qt.PointingHandCursor)
-        add_image_btn.setStyleSheet("""
-            QPushButton {
-                background-color: #0F172A;
-                color: #F8FAFC;
-                border: 1px solid #1E293B;
-                border-radius: 4px;
-                padding: 4px 8px;
-                text-align: left;
-            }
-            QPushButton:hover {
-                background-color: #1E293B;
-            }
-        """)
+        add_image_btn.setObjectName("inlineBtn")
         add_image_btn.setIconSize(QSize(16, 16))
         add_image_btn.clicked.connect(self.add_images)
         
@@ -191,34 +604,10 @@ class AddProductDialog(QDialog):
         self.cancel_btn = QPushButton("Annuler")
         self.cancel_btn.setObjectName("cancelBtn")
         self.cancel_btn.setCursor(Qt.PointingHandCursor)
-        self.cancel_btn.setStyleSheet("""
-            QPushButton {
-                background-color: #475569;
-                color: #F8FAFC;
-                border: none;
-                border-radius: 12px;
-                padding: 8px 16px;
-            }
-            QPushButton:hover {
-                background-color: #64748B;
-            }
-        """)
         self.cancel_btn.clicked.connect(self.reject)
         
         self.save_btn = QPushButton("Enregistrer")
         self.save_btn.setCursor(Qt.PointingHandCursor)
-        self.save_btn.setStyleSheet("""
-            QPushButton {
-                background-color: #3B82F6;
-                color: #F8FAFC;
-                border: none;
-                border-radius: 12px;
-                padding: 8px 16px;
-            }
-            QPushButton:hover {
-                background-color: #2563EB;
-            }
-        """)
         self.save_btn.clicked.connect(self.accept)
         
         buttons_layout.addStretch()
@@ -228,69 +617,26 @@ class AddProductDialog(QDialog):
         layout.addLayout(buttons_layout)
         
         # Apply styles
-        self.setStyleSheet("""
-            QDialog {
-                background-color: #0F172A;
-            }
-            QLabel {
-                color: #94A3B8;
-            }
-            QLineEdit, QComboBox, QSpinBox, QDoubleSpinBox {
-                background-color: #334155;
-                color: #F8FAFC;
-                border: 1px solid #475569;
-                border-radius: 12px;
-                padding: 8px;
-            }
-            QLineEdit:focus, QComboBox:focus, QSpinBox:focus, QDoubleSpinBox:focus {
-                border: 1px solid #3B82F6;
-            }
-            QPushButton {
-                background-color: #3B82F6;
-                color: #F8FAFC;
-                border: none;
-                border-radius: 12px;
-                padding: 8px 16px;
-                font-weight: bold;
-            }
-            QPushButton:hover {
-                background-color: #2563EB;
-            }
-            QPushButton:pressed {
-                background-color: #1D4ED8;
-            }
-            QPushButton#cancelBtn {
-                background-color: #475569;
-            }
-            QPushButton#cancelBtn:hover {
-                background-color: #64748B;
-            }
-        """)
-    
-    def mousePressEvent(self, event):
-        """Handle mouse press event for window dragging."""
-        if event.button() == Qt.LeftButton:
-            self.dragging = True
-            self.drag_position = event.globalPosition().toPoint() - self.frameGeometry().topLeft()
-            event.accept()
-    
-    def mouseMoveEvent(self, event):
-        """Handle mouse move event for window dragging."""
-        if event.buttons() & Qt.LeftButton and self.dragging:
-            self.move(event.globalPosition().toPoint() - self.drag_position)
-            event.accept()
-    
-    def mouseReleaseEvent(self, event):
-        """Handle mouse release event for window dragging."""
-        if event.button() == Qt.LeftButton:
-            self.dragging = False
-            event.accept()
+        self.setStyleSheet(DIALOG_STYLESHEET)
+    
+    def reset(self):
+        """Clear the form so the dialog can be shown again for another product."""
+        self.production_data = None
+        self.image_paths = []
+        
+        self.name_input.clear()
+        self.sku_input.clear()
+        self.category_input.setCurrentIndex(0)
+        self.price_input.setValue(0)
+        self.quantity_input.setValue(0)
+        self.reorder_level_input.setValue(0)
+        self.description_input.clear()
+        self.images_list.setText("Aucune image sélectionnée")
+        self.images_list.setStyleSheet("color: #94A3B8; font-style: italic;")
     
     def show_details(self):
         """Show the product details dialog."""
-        from views.product_details_dialog import ProductDetailsDialog
-        
-        dialog = ProductDetailsDialog(self.db, self)
+        dialog = product_details_dialog_class()(self.db, self)
         
         # If we already have production data, load it into the dialog
         if self.production_data:
@@ -376,18 +722,11 @@ class AddProductDialog(QDialog):
         }
 
 
-class AddRawMaterialDialog(QDialog):
+class AddRawMaterialDialog(DraggableDialog):
     """Dialog for adding a new raw material."""
     def __init__(self, parent=None):
-        # For window dragging
-        self.dragging = False
-        self.drag_position = None
-        
         super().__init__(parent)
         
-        # Remove window frame and title bar
-        self.setWindowFlags(Qt.Dialog | Qt.FramelessWindowHint)
-        self.setWindowOpacity(0.9)  # 10% transparency
         self.setMinimumWidth(400)
         
         # Main layout
@@ -407,20 +746,7 @@ class AddRawMaterialDialog(QDialog):
         close_btn = QPushButton("×")
         close_btn.setFixedSize(30, 30)
         close_btn.setCursor(Qt.PointingHandCursor)
-        close_btn.setStyleSheet("""
-            QPushButton {
-                background-color: transparent;
-                color: #94A3B8;
-                font-size: 20px;
-                font-weight: bold;
-                border: none;
-                border-radius: 15px;
-            }
-            QPushButton:hover {
-                background-color: #EF4444;
-                color: #F8FAFC;
-            }
-        """)
+        close_btn.setStyleSheet(CLOSE_BUTTON_STYLESHEET)
         close_btn.clicked.connect(self.reject)
         
         title_bar_layout.addWidget(title_label)
@@ -443,13 +769,13 @@ class AddRawMaterialDialog(QDialog):
         
         # Type
         self.type_input = QComboBox()
-        self.type_input.addItems(["Résine", "Plastique", "Métal", "Peinture", "Autre"])
+        self.type_input.addItems(MATERIAL_TYPES)
         self.type_input.setEditable(True)
         form_layout.addRow("Type:", self.type_input)
         
         # Unit
         self.unit_input = QComboBox()
-        self.unit_input.addItems(["kg", "g", "l", "ml", "unité", "m", "cm"])
+        self.unit_input.addItems(MATERIAL_UNITS)
         form_layout.addRow("Unité:", self.unit_input)
         
         # Cost per unit
@@ -494,63 +820,18 @@ class AddRawMaterialDialog(QDialog):
         layout.addLayout(buttons_layout)
         
         # Apply styles
-        self.setStyleSheet("""
-            QDialog {
-                background-color: #0F172A;
-            }
-            QLabel {
-                color: #94A3B8;
-            }
-            QLineEdit, QComboBox, QSpinBox, QDoubleSpinBox {
-                background-color: #334155;
-                color: #F8FAFC;
-                border: 1px solid #475569;
-                border-radius: 12px;
-                padding: 8px;
-            }
-            QLineEdit:focus, QComboBox:focus, QSpinBox:focus, QDoubleSpinBox:focus {
-                border: 1px solid #3B82F6;
-            }
-            QPushButton {
-                background-color: #3B82F6;
-                color: #F8FAFC;
-                border: none;
-                border-radius: 12px;
-                padding: 8px 16px;
-                font-weight: bold;
-            }
-            QPushButton:hover {
-                background-color: #2563EB;
-            }
-            QPushButton:pressed {
-                background-color: #1D4ED8;
-            }
-            QPushButton#cancelBtn {
-                background-color: #475569;
-            }
-            QPushButton#cancelBtn:hover {
-                background-color: #64748B;
-            }
-        """)
-    
-    def mousePressEvent(self, event):
-        """Handle mouse press event for window dragging."""
-        if event.button() == Qt.LeftButton:
-            self.dragging = True
-            self.drag_position = event.globalPosition().toPoint() - self.frameGeometry().topLeft()
-            event.accept()
-    
-    def mouseMoveEvent(self, event):
-        """Handle mouse move event for window dragging."""
-        if event.buttons() & Qt.LeftButton and self.dragging:
-            self.move(event.globalPosition().toPoint() - self.drag_position)
-            event.accept()
-    
-    def mouseReleaseEvent(self, event):
-        """Handle mouse release event for window dragging."""
-        if event.button() == Qt.LeftButton:
-            self.dragging = False
-            event.accept()
+        self.setStyleSheet(DIALOG_STYLESHEET)
+    
+    def reset(self):
+        """Clear the form so the dialog can be shown again for another material."""
+        self.name_input.clear()
+        self.ref_code_input.clear()
+        self.type_input.setCurrentIndex(0)
+        self.unit_input.setCurrentIndex(0)
+        self.cost_input.setValue(0)
+        self.quantity_input.setValue(0)
+        self.reorder_level_input.setValue(0)
+        self.supplier_input.clear()
     
     def get_material_data(self):
         """Get the material data from the form."""
@@ -566,18 +847,11 @@ class AddRawMaterialDialog(QDialog):
         }
 
 
-class ExportDialog(QDialog):
+class ExportDialog(DraggableDialog):
     """Dialog for exporting data."""
     def __init__(self, title="Exporter les données", parent=None):
-        # For window dragging
-        self.dragging = False
-        self.drag_position = None
-        
         super().__init__(parent)
         
-        # Remove window frame and title bar
-        self.setWindowFlags(Qt.Dialog | Qt.FramelessWindowHint)
-        self.setWindowOpacity(0.9)  # 10% transparency
         self.setMinimumWidth(400)
         
         # Main layout
@@ -597,20 +871,7 @@ class ExportDialog(QDialog):
         close_btn = QPushButton("×")
         close_btn.setFixedSize(30, 30)
         close_btn.setCursor(Qt.PointingHandCursor)
-        close_btn.setStyleSheet("""
-            QPushButton {
-                background-color: transparent;
-                color: #94A3B8;
-                font-size: 20px;
-                font-weight: bold;
-                border: none;
-                border-radius: 15px;
-            }
-            QPushButton:hover {
-                background-color: #EF4444;
-                color: #F8FAFC;
-            }
-        """)
+        close_btn.setStyleSheet(CLOSE_BUTTON_STYLESHEET)
         close_btn.clicked.connect(self.reject)
         
         title_bar_layout.addWidget(title_label)
@@ -630,25 +891,14 @@ class ExportDialog(QDialog):
         
         # File format
         self.format_combo = QComboBox()
-        self.format_combo.addItems(["CSV (.csv)", "Excel (.xlsx)", "PDF (.pdf)", "JSON (.json)"])
+        self.format_combo.addItems(EXPORT_FORMATS)
         form_layout.addRow("Format:", self.format_combo)
         
         layout.addLayout(form_layout)
         
         # Browse button
         browse_btn = QPushButton("Parcourir...")
-        browse_btn.setStyleSheet("""
-            QPushButton {
-                background-color: #334155;
-                color: #F8FAFC;
-                border: none;
-                border-radius: 12px;
-                padding: 8px 16px;
-            }
-            QPushButton:hover {
-                background-color: #475569;
-            }
-        """)
+        browse_btn.setObjectName("secondaryBtn")
         browse_btn.clicked.connect(self.browse_path)
         layout.addWidget(browse_btn)
         
@@ -669,55 +919,17 @@ class ExportDialog(QDialog):
         layout.addLayout(buttons_layout)
         
         # Apply styles
-        self.setStyleSheet("""
-            QDialog {
-                background-color: #0F172A;
-            }
-            QLabel {
-                color: #94A3B8;
-            }
-            QLineEdit, QComboBox {
-                background-color: #334155;
-                color: #F8FAFC;
-                border: 1px solid #475569;
-                border-radius: 12px;
-                padding: 8px;
-            }
-            QLineEdit:focus, QComboBox:focus {
-                border: 1px solid #3B82F6;
-            }
-            QPushButton {
-                background-color: #3B82F6;
-                color: #F8FAFC;
-                border: none;
-                border-radius: 12px;
-                padding: 8px 16px;
-                font-weight: bold;
-            }
-            QPushButton:hover {
-                background-color: #2563EB;
-            }
-            QPushButton:pressed {
-                background-color: #1D4ED8;
-            }
-            QPushButton#cancelBtn {
-                background-color: #475569;
-            }
-            QPushButton#cancelBtn:hover {
-                background-color: #64748B;
-            }
-        """)
+        self.setStyleSheet(DIALOG_STYLESHEET)
     
     def browse_path(self):
         """Open a file dialog to select the export path."""
-        file_format = self.format_combo.currentText()
-        extension = file_format.split("(")[1].split(")")[0]
+        file_filter = EXPORT_FILE_FILTERS[self.format_combo.currentText()]
         
         file_path, _ = QFileDialog.getSaveFileName(
             self,
             "Enregistrer le fichier",
             self.path_input.text(),
-            f"Fichiers {file_format};;Tous les fichiers (*)"
+            f"{file_filter};;Tous les fichiers (*)"
         )
         
         if file_path:
@@ -729,25 +941,107 @@ class ExportDialog(QDialog):
             "path": self.path_input.text(),
             "format": self.format_combo.currentText()
         }
+
+
+class ExportSignals(QObject):
+    """Signals reporting the outcome of an ExportTask to the GUI thread."""
+    # File path, then the CSV fallback warning (empty when the requested format was written)
+    finished = Signal(str, str)
+    failed = Signal(str)
+
+
+class ExportTask(QRunnable):
+    """Background task writing exported rows to a CSV, Excel, PDF or JSON file."""
+    def __init__(self, file_path, file_format, headers, rows, description, parent=None):
+        super().__init__()
+        
+        self.file_path = file_path
+        self.file_format = file_format
+        self.headers = headers
+        self.rows = rows
+        self.description = description
+        # Owned by the parent widget so it outlives the task until its signal is delivered
+        self.signals = ExportSignals(parent)
+    
+    def run(self):
+        """Write the file and report the outcome."""
+        try:
+            warning = self.write()
+        except Exception as e:
+            logging.error(f"Error exporting {self.description}: {e}")
+            self.signals.failed.emit(str(e))
+        else:
+            self.signals.finished.emit(self.file_path, warning or "")
+    
+    def write_csv(self):
+        """Write the rows as CSV."""
+        with open(self.file_path, 'w', newline='', encoding='utf-8') as csvfile:
+            writer = csv.writer(csvfile)
+            writer.writerow(self.headers)
+            writer.writerows(self.rows)
     
-    def mousePressEvent(self, event):
-        """Handle mouse press event for window dragging."""
-        if event.button() == Qt.LeftButton:
-            self.dragging = True
-            self.drag_position = event.globalPosition().toPoint() - self.frameGeometry().topLeft()
-            event.accept()
-    
-    def mouseMoveEvent(self, event):
-        """Handle mouse move event for window dragging."""
-        if event.buttons() & Qt.LeftButton and self.dragging:
-            self.move(event.globalPosition().toPoint() - self.drag_position)
-            event.accept()
-    
-    def mouseReleaseEvent(self, event):
-        """Handle mouse release event for window dragging."""
-        if event.button() == Qt.LeftButton:
-            self.dragging = False
-            event.accept()
+    def write(self):
+        """Write the rows in the selected format; return a warning if CSV was used instead."""
+        file_path = self.file_path
+        file_format = self.file_format
+        headers = self.headers
+        rows = self.rows
+        
+        # Export based on the selected format
+        if "CSV" in file_format:
+            self.write_csv()
+        
+        elif "Excel" in file_format:
+            pd = optional_module("pandas")
+            try:
+                if pd is None:
+                    raise ImportError("pandas")
+                df = pd.DataFrame(rows, columns=headers)
+                # pandas itself imports its .xlsx writer (openpyxl) here
+                df.to_excel(file_path, index=False)
+            except ImportError:
+                self.write_csv()
+                return "Module pandas non trouvé. Exportation en CSV à la place."
+        
+        elif "PDF" in file_format:
+            colors = optional_module("reportlab.lib.colors")
+            pagesizes = optional_module("reportlab.lib.pagesizes")
+            platypus = optional_module("reportlab.platypus")
+            if None in (colors, pagesizes, platypus):
+                self.write_csv()
+                return "Module reportlab non trouvé. Exportation en CSV à la place."
+            
+            doc = platypus.SimpleDocTemplate(file_path, pagesize=pagesizes.letter)
+            elements = []
+            
+            # Tuples are accepted as table rows, so no row is copied
+            t = platypus.Table([headers, *rows])
+            t.setStyle(platypus.TableStyle([
+                ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
+                ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+                ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+                ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+                ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
+                ('GRID', (0, 0), (-1, -1), 1, colors.black)
+            ]))
+            
+            elements.append(t)
+            doc.build(elements)
+        
+        elif "JSON" in file_format:
+            rows_list = [dict(zip(headers, row)) for row in rows]
+            
+            # orjson serialises natively and writes UTF-8 bytes directly
+            orjson = optional_module("orjson")
+            if orjson is not None:
+                with open(file_path, 'wb') as jsonfile:
+                    jsonfile.write(orjson.dumps(rows_list, option=orjson.OPT_INDENT_2))
+            else:
+                with open(file_path, 'w', encoding='utf-8') as jsonfile:
+                    json.dump(rows_list, jsonfile, indent=4, ensure_ascii=False)
+        
+        return None
 
 
 class StockView(QWidget):
@@ -758,6 +1052,13 @@ class StockView(QWidget):
         self.db = db
         self.products_data = []
         self.materials_data = []
+        # Product and raw material lists read by the tables, and the lists they were last filled from
+        self.query_cache = QueryCache(expiry_seconds=30)
+        self.loaded_products = None
+        self.loaded_materials = None
+        # Add/edit dialogs, built on first use and reused afterwards
+        self.product_dialog = None
+        self.material_dialog = None
         
         self.setup_ui()
         self.load_data()
@@ -794,14 +1095,21 @@ class StockView(QWidget):
         self.search_input = QLineEdit()
         self.search_input.setPlaceholderText("Rechercher...")
         
+        self.regex_btn = QPushButton(".*")
+        self.regex_btn.setCheckable(True)
+        self.regex_btn.setToolTip("Rechercher avec une expression régulière")
+        self.regex_btn.setCursor(Qt.PointingHandCursor)
+        self.regex_btn.toggled.connect(self.toggle_regex_search)
+        
         refresh_btn = QPushButton("Actualiser")
-        refresh_btn.setIcon(QIcon("src/resources/icons/refresh.png"))
+        refresh_btn.setIcon(cached_icon("src/resources/icons/refresh.png"))
         refresh_btn.setCursor(Qt.PointingHandCursor)
-        refresh_btn.clicked.connect(self.load_data)
+        refresh_btn.clicked.connect(self.refresh_stock)
         
         header_layout.addWidget(header_title)
         header_layout.addStretch()
         header_layout.addWidget(self.search_input)
+        header_layout.addWidget(self.regex_btn)
         header_layout.addWidget(refresh_btn)
         
         content_layout.addLayout(header_layout)
@@ -814,10 +1122,11 @@ class StockView(QWidget):
         self.setup_products_tab()
         self.tab_widget.addTab(self.products_tab, "Produits Finis")
         
-        # Raw materials tab
+        # Raw materials tab, built the first time it is shown
         self.materials_tab = QWidget()
-        self.setup_materials_tab()
+        self.materials_built = False
         self.tab_widget.addTab(self.materials_tab, "Matières Premières")
+        self.tab_widget.currentChanged.connect(self.on_tab_changed)
         
         content_layout.addWidget(self.tab_widget)
         
@@ -827,8 +1136,23 @@ class StockView(QWidget):
         # Add scroll area to main layout
         main_layout.addWidget(scroll_area)
         
+        # Filter once the user pauses typing rather than on every keystroke
+        self.filter_timer = QTimer(self)
+        self.filter_timer.setSingleShot(True)
+        self.filter_timer.setInterval(150)
+        self.filter_timer.timeout.connect(self.filter_tables)
+        
         # Connect signals after UI setup
-        self.search_input.textChanged.connect(self.filter_tables)
+        self.search_input.textChanged.connect(lambda text: self.filter_timer.start())
+        
+        # Success notification floating over the view, hidden after a few seconds
+        self.toast = QLabel(self)
+        self.toast.setStyleSheet(TOAST_STYLESHEET)
+        self.toast.hide()
+        self.toast_timer = QTimer(self)
+        self.toast_timer.setSingleShot(True)
+        self.toast_timer.setInterval(2500)
+        self.toast_timer.timeout.connect(self.toast.hide)
     
     def setup_products_tab(self):
         """Set up the finished products tab."""
@@ -843,7 +1167,7 @@ class StockView(QWidget):
         # Note: Products can only be added from product_view as per requirements
         
         self.products_export_btn = QPushButton("Exporter")
-        self.products_export_btn.setIcon(QIcon("src/resources/icons/export.png"))
+        self.products_export_btn.setIcon(cached_icon("src/resources/icons/export.png"))
         self.products_export_btn.setCursor(Qt.PointingHandCursor)
         self.products_export_btn.clicked.connect(self.export_products)
         
@@ -852,19 +1176,33 @@ class StockView(QWidget):
         
         tab_layout.addLayout(header_layout)
         
+        # Products model, filtered on every column but the ID and the actions
+        self.products_model = StockTableModel(PRODUCT_HEADERS, self)
+        self.products_proxy = StockFilterProxy(range(1, len(PRODUCT_HEADERS)), parent=self)
+        self.products_proxy.setSourceModel(self.products_model)
+        
         # Products table
-        self.products_table = QTableWidget()
-        self.products_table.setColumnCount(8)
-        self.products_table.setHorizontalHeaderLabels([
-            "ID", "Nom", "SKU", "Catégorie", "Prix", "Quantité", "Seuil", "Actions"
-        ])
+        self.products_table = QTableView()
+        self.products_table.setModel(self.products_proxy)
         self.products_table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
         self.products_table.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeToContents)
         self.products_table.horizontalHeader().setSectionResizeMode(7, QHeaderView.ResizeToContents)
         self.products_table.verticalHeader().setVisible(False)
-        self.products_table.setSelectionBehavior(QTableWidget.SelectRows)
-        self.products_table.setEditTriggers(QTableWidget.NoEditTriggers)
+        # Rows tall enough for the painted action buttons
+        self.products_table.verticalHeader().setDefaultSectionSize(38)
+        self.products_table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.products_table.setEditTriggers(QAbstractItemView.NoEditTriggers)
         self.products_table.setAlternatingRowColors(True)
+        # Keep the database order until the user clicks a header
+        self.products_table.horizontalHeader().setSortIndicator(-1, Qt.AscendingOrder)
+        self.products_table.setSortingEnabled(True)
+        
+        # Action buttons
+        products_actions = IconButtonsDelegate((
+            ("src/resources/icons/edit.png", "Modifier", self.edit_product),
+            ("src/resources/icons/delete.png", "Supprimer", self.delete_product),
+        ), self.products_table)
+        self.products_table.setItemDelegateForColumn(7, products_actions)
         
         tab_layout.addWidget(self.products_table)
     
@@ -879,12 +1217,12 @@ class StockView(QWidget):
         header_layout = QHBoxLayout()
         
         add_material_btn = QPushButton("Ajouter une Matière Première")
-        add_material_btn.setIcon(QIcon("src/resources/icons/add.png"))
+        add_material_btn.setIcon(cached_icon("src/resources/icons/add.png"))
         add_material_btn.setCursor(Qt.PointingHandCursor)
         add_material_btn.clicked.connect(self.add_material)
         
         self.materials_export_btn = QPushButton("Exporter")
-        self.materials_export_btn.setIcon(QIcon("src/resources/icons/export.png"))
+        self.materials_export_btn.setIcon(cached_icon("src/resources/icons/export.png"))
         self.materials_export_btn.setCursor(Qt.PointingHandCursor)
         self.materials_export_btn.clicked.connect(self.export_materials)
         
@@ -894,198 +1232,277 @@ class StockView(QWidget):
         
         tab_layout.addLayout(header_layout)
         
+        # Materials model, filtered on every column but the ID and the actions
+        self.materials_model = StockTableModel(MATERIAL_HEADERS, self)
+        # Type and unit only take a handful of values, so they are filtered by code
+        self.materials_proxy = StockFilterProxy(range(1, len(MATERIAL_HEADERS)), (3, 4), self)
+        self.materials_proxy.setSourceModel(self.materials_model)
+        
         # Materials table
-        self.materials_table = QTableWidget()
-        self.materials_table.setColumnCount(9)
-        self.materials_table.setHorizontalHeaderLabels([
-            "ID", "Nom", "Référence", "Type", "Unité", "Coût", "Quantité", "Seuil", "Actions"
-        ])
+        self.materials_table = QTableView()
+        self.materials_table.setModel(self.materials_proxy)
         self.materials_table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
         self.materials_table.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeToContents)
         self.materials_table.horizontalHeader().setSectionResizeMode(8, QHeaderView.ResizeToContents)
         self.materials_table.verticalHeader().setVisible(False)
-        self.materials_table.setSelectionBehavior(QTableWidget.SelectRows)
-        self.materials_table.setEditTriggers(QTableWidget.NoEditTriggers)
+        # Rows tall enough for the painted action buttons
+        self.materials_table.verticalHeader().setDefaultSectionSize(38)
+        self.materials_table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.materials_table.setEditTriggers(QAbstractItemView.NoEditTriggers)
         self.materials_table.setAlternatingRowColors(True)
+        # Keep the database order until the user clicks a header
+        self.materials_table.horizontalHeader().setSortIndicator(-1, Qt.AscendingOrder)
+        self.materials_table.setSortingEnabled(True)
+        
+        # Action buttons
+        materials_actions = IconButtonsDelegate((
+            ("src/resources/icons/edit.png", "Modifier", self.edit_material),
+            ("src/resources/icons/delete.png", "Supprimer", self.delete_material),
+        ), self.materials_table)
+        self.materials_table.setItemDelegateForColumn(8, materials_actions)
         
         tab_layout.addWidget(self.materials_table)
     
     def load_data(self):
         """Load data from the database."""
         try:
-            # Load products
-            products = self.db.query(Product).order_by(Product.name).all()
-            self.products_data = products
-            self.update_products_table()
+            # A cache hit returns the list the table was last filled from, so it is left as it is
+            products = self.query_products()
+            if products is not self.loaded_products:
+                self.loaded_products = products
+                # Copied so appended rows do not leak into the cached list
+                self.products_data = list(products)
+                self.update_products_table()
             
-            # Load raw materials
-            materials = self.db.query(RawMaterial).order_by(RawMaterial.name).all()
-            self.materials_data = materials
-            self.update_materials_table()
+            # Load raw materials, once their tab has been built
+            if self.materials_built:
+                self.load_materials()
             
         except Exception as e:
             logging.error(f"Error loading stock data: {e}")
             QMessageBox.critical(self, "Erreur", f"Impossible de charger les données: {e}")
     
-    def update_products_table(self):
-        """Update the products table with current data."""
-        self.products_table.setRowCount(0)
+    def load_materials(self):
+        """Load the raw materials from the database into their table."""
+        materials = self.query_materials()
+        if materials is not self.loaded_materials:
+            self.loaded_materials = materials
+            self.materials_data = list(materials)
+            self.update_materials_table()
+    
+    def on_tab_changed(self, index):
+        """Build the raw materials tab when it is first shown."""
+        if self.tab_widget.widget(index) is self.materials_tab and not self.materials_built:
+            self.build_materials_tab()
+    
+    def build_materials_tab(self):
+        """Build and fill the raw materials tab."""
+        self.setup_materials_tab()
+        self.materials_built = True
         
-        for product in self.products_data:
-            row = self.products_table.rowCount()
-            self.products_table.insertRow(row)
-            
-            # Add data cells
-            # ID
-            item = QTableWidgetItem(str(product.id))
-            self.products_table.setItem(row, 0, item)
-            
-            # Name
-            item = QTableWidgetItem(product.name)
-            self.products_table.setItem(row, 1, item)
-            
-            # SKU (using a placeholder since it's not in the model)
-            item = QTableWidgetItem("SKU-" + str(product.id))
-            self.products_table.setItem(row, 2, item)
-            
+        # Apply the search already typed in the shared search box
+        self.materials_proxy.set_regex_enabled(self.regex_btn.isChecked())
+        self.materials_proxy.set_filter_text(self.search_input.text())
+        
+        try:
+            self.load_materials()
+        except Exception as e:
+            logging.error(f"Error loading stock data: {e}")
+            QMessageBox.critical(self, "Erreur", f"Impossible de charger les données: {e}")
+    
+    def query_products(self, fresh=False):
+        """Return the products ordered by name, from the cache while it is fresh unless fresh is set."""
+        if fresh:
+            # Changes made outside this view are not in the cache
+            self.query_cache.invalidate("products")
+        return self.query_cache.get(
+            ("products", "by_name"),
+            lambda: self.db.query(*PRODUCT_COLUMNS).order_by(Product.name).all()
+        )
+    
+    def query_materials(self, fresh=False):
+        """Return the raw materials ordered by name, from the cache while it is fresh unless fresh is set."""
+        if fresh:
+            # Changes made outside this view are not in the cache
+            self.query_cache.invalidate("materials")
+        return self.query_cache.get(
+            ("materials", "by_name"),
+            lambda: self.db.query(*MATERIAL_COLUMNS).order_by(RawMaterial.name).all()
+        )
+    
+    def refresh_data(self):
+        """Reload the stock when the main window shows or auto-refreshes this view, through the query cache."""
+        self.load_data()
+    
+    def refresh_stock(self):
+        """Reload the stock from the database, bypassing the query cache."""
+        self.query_cache.invalidate()
+        self.load_data()
+    
+    def product_row(self, product):
+        """Build the raw values of a product row."""
+        return (
+            product.id,
+            product.name,
+            # SKU (a placeholder computed by the database from the id)
+            product.sku,
             # Category (using a placeholder since it's not in the model)
-            item = QTableWidgetItem("Produit")
-            self.products_table.setItem(row, 3, item)
-            
+            "Produit",
             # Price (using production_cost from the model)
-            item = QTableWidgetItem(str(product.production_cost))
-            self.products_table.setItem(row, 4, item)
-            
+            product.production_cost,
             # Quantity (using initial_quantity from the model)
-            item = QTableWidgetItem(str(product.initial_quantity))
-            self.products_table.setItem(row, 5, item)
-            
+            product.initial_quantity,
             # Reorder level (using a placeholder since it's not in the model)
-            item = QTableWidgetItem("5")
-            self.products_table.setItem(row, 6, item)
-            
-            # Add action buttons
-            actions_widget = QWidget()
-            actions_layout = QHBoxLayout(actions_widget)
-            actions_layout.setContentsMargins(4, 4, 4, 4)
-            actions_layout.setSpacing(4)
-            
-            edit_btn = QPushButton()
-            edit_btn.setIcon(QIcon("src/resources/icons/edit.png"))
-            edit_btn.setToolTip("Modifier")
-            edit_btn.setFixedSize(30, 30)
-            edit_btn.setCursor(Qt.PointingHandCursor)
-            edit_btn.clicked.connect(lambda checked=False, pid=product.id: self.edit_product(pid))
-            
-            delete_btn = QPushButton()
-            delete_btn.setIcon(QIcon("src/resources/icons/delete.png"))
-            delete_btn.setToolTip("Supprimer")
-            delete_btn.setFixedSize(30, 30)
-            delete_btn.setCursor(Qt.PointingHandCursor)
-            delete_btn.clicked.connect(lambda checked=False, pid=product.id: self.delete_product(pid))
-            
-            actions_layout.addWidget(edit_btn)
-            actions_layout.addWidget(delete_btn)
-            actions_layout.addStretch()
-            
-            self.products_table.setCellWidget(row, 7, actions_widget)
+            5
+        )
+    
+    # Raw values of a raw material row, one per column, gathered in a single C call
+    material_row = staticmethod(operator.attrgetter(
+        "id", "name", "reference_code", "type", "unit", "cost", "quantity", "reorder_level"
+    ))
+    
+    def product_export_row(self, product):
+        """Build the exported values of a product: its table row, then its description."""
+        return self.product_row(product) + (product.description or "",)
+    
+    # Exported values of a raw material: its table row, then its supplier
+    material_export_row = staticmethod(operator.attrgetter(
+        "id", "name", "reference_code", "type", "unit", "cost", "quantity", "reorder_level",
+        "supplier"
+    ))
+    
+    def populate_table(self, model, proxy, rows):
+        """Replace the rows of a stock table."""
+        # The proxy filters the rows as soon as the model is reset, so it needs them indexed first
+        proxy.set_source_rows(rows)
+        model.set_rows(rows)
+    
+    def append_table_row(self, model, proxy, row):
+        """Append a single row to a stock table."""
+        proxy.append_source_row(row)
+        model.append_row(row)
+    
+    def replace_table_row(self, model, proxy, position, row):
+        """Replace a single row of a stock table."""
+        proxy.replace_source_row(position, row)
+        model.replace_row(position, row)
+    
+    def remove_table_row(self, model, proxy, position):
+        """Remove a single row from a stock table."""
+        proxy.remove_source_row(position)
+        model.remove_row(position)
+    
+    def update_products_table(self):
+        """Update the products table with current data."""
+        rows = list(map(self.product_row, self.products_data))
+        self.populate_table(self.products_model, self.products_proxy, rows)
     
     def update_materials_table(self):
         """Update the materials table with current data."""
-        self.materials_table.setRowCount(0)
-        
-        for material in self.materials_data:
-            row = self.materials_table.rowCount()
-            self.materials_table.insertRow(row)
-            
-            # Add data cells
-            # ID
-            item = QTableWidgetItem(str(material.id))
-            self.materials_table.setItem(row, 0, item)
-            
-            # Name
-            item = QTableWidgetItem(material.name)
-            self.materials_table.setItem(row, 1, item)
-            
-            # Reference code
-            item = QTableWidgetItem(material.reference_code)
-            self.materials_table.setItem(row, 2, item)
-            
-            # Type
-            item = QTableWidgetItem(material.type)
-            self.materials_table.setItem(row, 3, item)
-            
-            # Unit
-            item = QTableWidgetItem(material.unit)
-            self.materials_table.setItem(row, 4, item)
-            
-            # Cost
-            item = QTableWidgetItem(str(material.cost))
-            self.materials_table.setItem(row, 5, item)
-            
-            # Quantity
-            item = QTableWidgetItem(str(material.quantity))
-            self.materials_table.setItem(row, 6, item)
-            
-            # Reorder level
-            item = QTableWidgetItem(str(material.reorder_level))
-            self.materials_table.setItem(row, 7, item)
-            
-            # Add action buttons
-            actions_widget = QWidget()
-            actions_layout = QHBoxLayout(actions_widget)
-            actions_layout.setContentsMargins(4, 4, 4, 4)
-            actions_layout.setSpacing(4)
-            
-            edit_btn = QPushButton()
-            edit_btn.setIcon(QIcon("src/resources/icons/edit.png"))
-            edit_btn.setToolTip("Modifier")
-            edit_btn.setFixedSize(30, 30)
-            edit_btn.setCursor(Qt.PointingHandCursor)
-            edit_btn.clicked.connect(lambda checked=False, mid=material.id: self.edit_material(mid))
-            
-            delete_btn = QPushButton()
-            delete_btn.setIcon(QIcon("src/resources/icons/delete.png"))
-            delete_btn.setToolTip("Supprimer")
-            delete_btn.setFixedSize(30, 30)
-            delete_btn.setCursor(Qt.PointingHandCursor)
-            delete_btn.clicked.connect(lambda checked=False, mid=material.id: self.delete_material(mid))
-            
-            actions_layout.addWidget(edit_btn)
-            actions_layout.addWidget(delete_btn)
-            actions_layout.addStretch()
-            
-            self.materials_table.setCellWidget(row, 8, actions_widget)
+        rows = list(map(self.material_row, self.materials_data))
+        self.populate_table(self.materials_model, self.materials_proxy, rows)
+    
+    def append_product_row(self, product):
+        """Append a single product to the table without reloading it."""
+        self.products_data.append(product)
+        self.append_table_row(self.products_model, self.products_proxy, self.product_row(product))
+    
+    def append_material_row(self, material):
+        """Append a single raw material to the table without reloading it."""
+        self.materials_data.append(material)
+        self.append_table_row(self.materials_model, self.materials_proxy, self.material_row(material))
+    
+    def replace_product_row(self, product):
+        """Show the edited values of a product without reloading the table."""
+        position = self.products_model.row_position(product.id)
+        if position is None:
+            self.load_data()
+            return
+        self.products_data[position] = product
+        self.replace_table_row(self.products_model, self.products_proxy, position, self.product_row(product))
+    
+    def replace_material_row(self, material):
+        """Show the edited values of a raw material without reloading the table."""
+        position = self.materials_model.row_position(material.id)
+        if position is None:
+            self.load_data()
+            return
+        self.materials_data[position] = material
+        self.replace_table_row(self.materials_model, self.materials_proxy, position, self.material_row(material))
+    
+    def remove_product_row(self, product_id):
+        """Remove a deleted product from the table without reloading it."""
+        position = self.products_model.row_position(product_id)
+        if position is None:
+            self.load_data()
+            return
+        del self.products_data[position]
+        self.remove_table_row(self.products_model, self.products_proxy, position)
+    
+    def remove_material_row(self, material_id):
+        """Remove a deleted raw material from the table without reloading it."""
+        position = self.materials_model.row_position(material_id)
+        if position is None:
+            self.load_data()
+            return
+        del self.materials_data[position]
+        self.remove_table_row(self.materials_model, self.materials_proxy, position)
     
     def filter_tables(self):
         """Filter tables based on search input."""
-        search_text = self.search_input.text().lower()
-        
-        # Filter products table
-        for row in range(self.products_table.rowCount()):
-            match = False
-            for col in range(1, 7):  # Skip ID column and actions column
-                item = self.products_table.item(row, col)
-                if item and search_text in item.text().lower():
-                    match = True
-                    break
-            
-            self.products_table.setRowHidden(row, not match)
-        
-        # Filter materials table
-        for row in range(self.materials_table.rowCount()):
-            match = False
-            for col in range(1, 8):  # Skip ID column and actions column
-                item = self.materials_table.item(row, col)
-                if item and search_text in item.text().lower():
-                    match = True
-                    break
-            
-            self.materials_table.setRowHidden(row, not match)
+        search_text = self.search_input.text()
+        
+        # The raw materials tab only exists once it has been shown
+        tables = [self.products_table]
+        proxies = [self.products_proxy]
+        if self.materials_built:
+            tables.append(self.materials_table)
+            proxies.append(self.materials_proxy)
+        
+        # Repaint each table once after filtering rather than per row change
+        for table in tables:
+            table.setUpdatesEnabled(False)
+        try:
+            for proxy in proxies:
+                proxy.set_filter_text(search_text)
+        finally:
+            for table in tables:
+                table.setUpdatesEnabled(True)
+    
+    def toggle_regex_search(self, enabled):
+        """Switch the search box between literal and regular-expression search."""
+        self.products_proxy.set_regex_enabled(enabled)
+        if self.materials_built:
+            self.materials_proxy.set_regex_enabled(enabled)
+    
+    def show_toast(self, text):
+        """Show a success message at the bottom of the view without blocking it."""
+        self.toast.setText(text)
+        self.toast.adjustSize()
+        self.toast.move((self.width() - self.toast.width()) // 2, self.height() - self.toast.height() - 20)
+        self.toast.raise_()
+        self.toast.show()
+        self.toast_timer.start()
+    
+    def product_form(self, title=""):
+        """Return the product dialog, cleared for a new add or edit."""
+        if self.product_dialog is None:
+            self.product_dialog = AddProductDialog(self.db, self)
+        self.product_dialog.reset()
+        self.product_dialog.setWindowTitle(title)
+        return self.product_dialog
+    
+    def material_form(self, title=""):
+        """Return the raw material dialog, cleared for a new add or edit."""
+        if self.material_dialog is None:
+            self.material_dialog = AddRawMaterialDialog(self)
+        self.material_dialog.reset()
+        self.material_dialog.setWindowTitle(title)
+        return self.material_dialog
     
     def add_product(self):
         """Add a new product."""
-        dialog = AddProductDialog(self.db, self)
+        dialog = self.product_form()
         if dialog.exec():
             try:
                 product_data = dialog.get_product_data()
@@ -1102,11 +1519,12 @@ class StockView(QWidget):
                 # Add to database
                 self.db.add(new_product)
                 self.db.commit()
+                self.query_cache.invalidate("products")
                 
-                # Refresh the data
-                self.load_data()
+                # Show the new row without reloading the whole table
+                self.append_product_row(new_product)
                 
-                QMessageBox.information(self, "Succès", "Produit ajouté avec succès.")
+                self.show_toast("Produit ajouté avec succès.")
                 
             except Exception as e:
                 self.db.rollback()
@@ -1117,17 +1535,16 @@ class StockView(QWidget):
         """Edit an existing product."""
         try:
             # Get the product from the database
-            product = self.db.query(Product).filter(Product.id == product_id).first()
+            product = self.db.get(Product, product_id)
             
             if not product:
                 QMessageBox.warning(self, "Avertissement", "Produit non trouvé.")
                 return
             
             # Create and populate the dialog
-            dialog = AddProductDialog(self.db, self)
-            dialog.setWindowTitle("Modifier un Produit")
+            dialog = self.product_form("Modifier un Produit")
             dialog.name_input.setText(product.name)
-            dialog.sku_input.setText("SKU-" + str(product.id))  # Using placeholder
+            dialog.sku_input.setText(product.sku)  # Using placeholder
             dialog.category_input.setCurrentText("Produit")  # Using placeholder
             dialog.price_input.setValue(float(product.production_cost))
             dialog.quantity_input.setValue(int(product.initial_quantity))
@@ -1145,9 +1562,10 @@ class StockView(QWidget):
                 # Keep the existing production_time value
                 
                 self.db.commit()
-                self.load_data()  # Refresh the data
+                self.query_cache.invalidate("products")
+                self.replace_product_row(product)
                 
-                QMessageBox.information(self, "Succès", "Produit mis à jour avec succès.")
+                self.show_toast("Produit mis à jour avec succès.")
                 
         except Exception as e:
             self.db.rollback()
@@ -1167,7 +1585,7 @@ class StockView(QWidget):
         if confirm == QMessageBox.Yes:
             try:
                 # Get the product from the database
-                product = self.db.query(Product).filter(Product.id == product_id).first()
+                product = self.db.get(Product, product_id)
                 
                 if not product:
                     QMessageBox.warning(self, "Avertissement", "Produit non trouvé.")
@@ -1176,11 +1594,12 @@ class StockView(QWidget):
                 # Delete the product
                 self.db.delete(product)
                 self.db.commit()
+                self.query_cache.invalidate("products")
                 
-                # Refresh the data
-                self.load_data()
+                # Remove the row without reloading the whole table
+                self.remove_product_row(product_id)
                 
-                QMessageBox.information(self, "Succès", "Produit supprimé avec succès.")
+                self.show_toast("Produit supprimé avec succès.")
                 
             except Exception as e:
                 self.db.rollback()
@@ -1189,7 +1608,7 @@ class StockView(QWidget):
     
     def add_material(self):
         """Add a new raw material."""
-        dialog = AddRawMaterialDialog(self)
+        dialog = self.material_form()
         if dialog.exec():
             try:
                 material_data = dialog.get_material_data()
@@ -1209,11 +1628,12 @@ class StockView(QWidget):
                 # Add to database
                 self.db.add(new_material)
                 self.db.commit()
+                self.query_cache.invalidate("materials")
                 
-                # Refresh the data
-                self.load_data()
+                # Show the new row without reloading the whole table
+                self.append_material_row(new_material)
                 
-                QMessageBox.information(self, "Succès", "Matière première ajoutée avec succès.")
+                self.show_toast("Matière première ajoutée avec succès.")
                 
             except Exception as e:
                 self.db.rollback()
@@ -1224,15 +1644,14 @@ class StockView(QWidget):
         """Edit an existing raw material."""
         try:
             # Get the material from the database
-            material = self.db.query(RawMaterial).filter(RawMaterial.id == material_id).first()
+            material = self.db.get(RawMaterial, material_id)
             
             if not material:
                 QMessageBox.warning(self, "Avertissement", "Matière première non trouvée.")
                 return
             
             # Create and populate the dialog
-            dialog = AddRawMaterialDialog(self)
-            dialog.setWindowTitle("Modifier une Matière Première")
+            dialog = self.material_form("Modifier une Matière Première")
             dialog.name_input.setText(material.name)
             dialog.ref_code_input.setText(material.reference_code)
             dialog.type_input.setCurrentText(material.type)
@@ -1256,9 +1675,10 @@ class StockView(QWidget):
                 material.supplier = updated_data["supplier"]
                 
                 self.db.commit()
-                self.load_data()  # Refresh the data
+                self.query_cache.invalidate("materials")
+                self.replace_material_row(material)
                 
-                QMessageBox.information(self, "Succès", "Matière première mise à jour avec succès.")
+                self.show_toast("Matière première mise à jour avec succès.")
                 
         except Exception as e:
             self.db.rollback()
@@ -1278,7 +1698,7 @@ class StockView(QWidget):
         if confirm == QMessageBox.Yes:
             try:
                 # Get the material from the database
-                material = self.db.query(RawMaterial).filter(RawMaterial.id == material_id).first()
+                material = self.db.get(RawMaterial, material_id)
                 
                 if not material:
                     QMessageBox.warning(self, "Avertissement", "Matière première non trouvée.")
@@ -1287,11 +1707,12 @@ class StockView(QWidget):
                 # Delete the material
                 self.db.delete(material)
                 self.db.commit()
+                self.query_cache.invalidate("materials")
                 
-                # Refresh the data
-                self.load_data()
+                # Remove the row without reloading the whole table
+                self.remove_material_row(material_id)
                 
-                QMessageBox.information(self, "Succès", "Matière première supprimée avec succès.")
+                self.show_toast("Matière première supprimée avec succès.")
                 
             except Exception as e:
                 self.db.rollback()
@@ -1303,91 +1724,10 @@ class StockView(QWidget):
         dialog = ExportDialog("Exporter les Produits", self)
         if dialog.exec():
             try:
-                export_data = dialog.get_export_data()
-                file_path = export_data["path"]
-                file_format = export_data["format"]
-                
-                # Get the data to export using SQLAlchemy
-                products_query = self.db.query(Product).order_by(Product.name).all()
-                
-                # Convert to a list of lists for export
-                products = []
-                for product in products_query:
-                    products.append([
-                        product.id,
-                        product.name,
-                        f"SKU-{product.id}",  # Placeholder
-                        "Produit",  # Placeholder
-                        product.production_cost,
-                        product.initial_quantity,
-                        5,  # Placeholder for reorder level
-                        product.description or ""
-                    ])
-                
-                # Headers for the export
-                headers = ["ID", "Nom", "SKU", "Catégorie", "Prix", "Quantité", "Seuil", "Description"]
-                
-                # Export based on the selected format
-                if "CSV" in file_format:
-                    with open(file_path, 'w', newline='', encoding='utf-8') as csvfile:
-                        writer = csv.writer(csvfile)
-                        writer.writerow(headers)
-                        writer.writerows(products)
-                
-                elif "Excel" in file_format:
-                    try:
-                        import pandas as pd
-                        df = pd.DataFrame(products, columns=headers)
-                        df.to_excel(file_path, index=False)
-                    except ImportError:
-                        QMessageBox.warning(self, "Avertissement", "Module pandas non trouvé. Exportation en CSV à la place.")
-                        with open(file_path, 'w', newline='', encoding='utf-8') as csvfile:
-                            writer = csv.writer(csvfile)
-                            writer.writerow(headers)
-                            writer.writerows(products)
-                
-                elif "PDF" in file_format:
-                    try:
-                        from reportlab.lib import colors
-                        from reportlab.lib.pagesizes import letter
-                        from reportlab.platypus import SimpleDocTemplate, Table, TableStyle
-                        
-                        doc = SimpleDocTemplate(file_path, pagesize=letter)
-                        elements = []
-                        
-                        data = [headers] + [list(product) for product in products]
-                        t = Table(data)
-                        t.setStyle(TableStyle([
-                            ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
-                            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-                            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-                            ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-                            ('GRID', (0, 0), (-1, -1), 1, colors.black)
-                        ]))
-                        
-                        elements.append(t)
-                        doc.build(elements)
-                    except ImportError:
-                        QMessageBox.warning(self, "Avertissement", "Module reportlab non trouvé. Exportation en CSV à la place.")
-                        with open(file_path, 'w', newline='', encoding='utf-8') as csvfile:
-                            writer = csv.writer(csvfile)
-                            writer.writerow(headers)
-                            writer.writerows(products)
-                
-                elif "JSON" in file_format:
-                    products_list = []
-                    for product in products:
-                        products_list.append({
-                            headers[i]: product[i] for i in range(len(headers))
-                        })
-                    
-                    with open(file_path, 'w', encoding='utf-8') as jsonfile:
-                        json.dump(products_list, jsonfile, indent=4, ensure_ascii=False)
-                
-                QMessageBox.information(self, "Succès", f"Données exportées avec succès vers {file_path}")
-                
+                # Rows are read from the session here, as it must not be used by the export thread;
+                # they are queried again so the file holds the current data, not the cached rows
+                rows = list(map(self.product_export_row, self.query_products(fresh=True)))
+                self.start_export(dialog.get_export_data(), PRODUCT_EXPORT_HEADERS, rows, "products")
             except Exception as e:
                 logging.error(f"Error exporting products: {e}")
                 QMessageBox.critical(self, "Erreur", f"Impossible d'exporter les données: {e}")
@@ -1397,92 +1737,29 @@ class StockView(QWidget):
         dialog = ExportDialog("Exporter les Matières Premières", self)
         if dialog.exec():
             try:
-                export_data = dialog.get_export_data()
-                file_path = export_data["path"]
-                file_format = export_data["format"]
-                
-                # Get the data to export using SQLAlchemy
-                materials_query = self.db.query(RawMaterial).order_by(RawMaterial.name).all()
-                
-                # Convert to a list of lists for export
-                materials = []
-                for material in materials_query:
-                    materials.append([
-                        material.id,
-                        material.name,
-                        material.reference_code,
-                        material.type,
-                        material.unit,
-                        material.cost,
-                        material.quantity,
-                        material.reorder_level,
-                        material.supplier
-                    ])
-                
-                # Headers for the export
-                headers = ["ID", "Nom", "Référence", "Type", "Unité", "Coût", "Quantité", "Seuil", "Fournisseur"]
-                
-                # Export based on the selected format
-                if "CSV" in file_format:
-                    with open(file_path, 'w', newline='', encoding='utf-8') as csvfile:
-                        writer = csv.writer(csvfile)
-                        writer.writerow(headers)
-                        writer.writerows(materials)
-                
-                elif "Excel" in file_format:
-                    try:
-                        import pandas as pd
-                        df = pd.DataFrame(materials, columns=headers)
-                        df.to_excel(file_path, index=False)
-                    except ImportError:
-                        QMessageBox.warning(self, "Avertissement", "Module pandas non trouvé. Exportation en CSV à la place.")
-                        with open(file_path, 'w', newline='', encoding='utf-8') as csvfile:
-                            writer = csv.writer(csvfile)
-                            writer.writerow(headers)
-                            writer.writerows(materials)
-                
-                elif "PDF" in file_format:
-                    try:
-                        from reportlab.lib import colors
-                        from reportlab.lib.pagesizes import letter
-                        from reportlab.platypus import SimpleDocTemplate, Table, TableStyle
-                        
-                        doc = SimpleDocTemplate(file_path, pagesize=letter)
-                        elements = []
-                        
-                        data = [headers] + [list(material) for material in materials]
-                        t = Table(data)
-                        t.setStyle(TableStyle([
-                            ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
-                            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-                            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-                            ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-                            ('GRID', (0, 0), (-1, -1), 1, colors.black)
-                        ]))
-                        
-                        elements.append(t)
-                        doc.build(elements)
-                    except ImportError:
-                        QMessageBox.warning(self, "Avertissement", "Module reportlab non trouvé. Exportation en CSV à la place.")
-                        with open(file_path, 'w', newline='', encoding='utf-8') as csvfile:
-                            writer = csv.writer(csvfile)
-                            writer.writerow(headers)
-                            writer.writerows(materials)
-                
-                elif "JSON" in file_format:
-                    materials_list = []
-                    for material in materials:
-                        materials_list.append({
-                            headers[i]: material[i] for i in range(len(headers))
-                        })
-                    
-                    with open(file_path, 'w', encoding='utf-8') as jsonfile:
-                        json.dump(materials_list, jsonfile, indent=4, ensure_ascii=False)
-                
-                QMessageBox.information(self, "Succès", f"Données exportées avec succès vers {file_path}")
-                
+                # Rows are read from the session here, as it must not be used by the export thread;
+                # they are queried again so the file holds the current data, not the cached rows
+                rows = list(map(self.material_export_row, self.query_materials(fresh=True)))
+                self.start_export(dialog.get_export_data(), MATERIAL_EXPORT_HEADERS, rows, "materials")
             except Exception as e:
                 logging.error(f"Error exporting materials: {e}")
                 QMessageBox.critical(self, "Erreur", f"Impossible d'exporter les données: {e}")
+    
+    def start_export(self, export_data, headers, rows, description):
+        """Write the exported rows to the chosen file on a background thread."""
+        task = ExportTask(export_data["path"], export_data["format"], headers, rows, description, self)
+        task.signals.finished.connect(self.export_finished)
+        task.signals.failed.connect(self.export_failed)
+        QThreadPool.globalInstance().start(task)
+    
+    def export_finished(self, file_path, warning):
+        """Report a completed export."""
+        self.sender().deleteLater()
+        if warning:
+            QMessageBox.warning(self, "Avertissement", warning)
+        QMessageBox.information(self, "Succès", f"Données exportées avec succès vers {file_path}")
+    
+    def export_failed(self, error):
+        """Report a failed export."""
+        self.sender().deleteLater()
+        QMessageBox.critical(self, "Erreur", f"Impossible d'exporter les données: {error}")
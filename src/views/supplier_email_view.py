@@ -1,46 +1,140 @@
 """
 Supplier email view for the application.
 """
-import os
-import sys
 import logging
+import re
 import datetime
+import functools
+import html
 from PySide6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, 
     QFrame, QGridLayout, QScrollArea, QTableWidget, QTableWidgetItem,
-    QHeaderView, QSizePolicy, QDialog, QLineEdit, QFormLayout,
+    QHeaderView, QSizePolicy, QLineEdit, QFormLayout,
     QComboBox, QMessageBox, QSpinBox, QDoubleSpinBox, QTextEdit,
     QTabWidget, QSplitter, QListWidget, QListWidgetItem
 )
-from PySide6.QtCore import Qt, Signal, Slot, QSize
-from PySide6.QtGui import QIcon, QFont, QColor, QPainter
-
-# Add the parent directory to sys.path to allow imports
-sys.path.insert(0, os.path.abspath(os.path.dirname(__file__) + '/../..'))
+from PySide6.QtCore import Qt, Signal, Slot, QSize, QTimer
+from PySide6.QtGui import QFont, QColor, QPainter
+from sqlalchemy import insert
 
 from database.base import SessionLocal
 from models import Supplier, SupplierEmail, EmailStatus
-import config
+from views.common import DraggableDialog, cached_icon
+
+
+# Stylesheet shared by the email dialogs, set once on each dialog and matched to its
+# widgets by object name rather than parsed again for every widget
+DIALOG_STYLESHEET = """
+QLabel#titleLabel, QLabel#subjectLabel {
+    color: #F8FAFC;
+    font-size: 18px;
+    font-weight: bold;
+}
+QLabel#headerLabel {
+    color: #94A3B8;
+}
+QPushButton#closeBtn {
+    background-color: transparent;
+    color: #94A3B8;
+    font-size: 20px;
+    font-weight: bold;
+    border: none;
+    border-radius: 15px;
+}
+QPushButton#closeBtn:hover {
+    background-color: #EF4444;
+    color: #F8FAFC;
+}
+QFrame#headerFrame, QFrame#contentFrame {
+    background-color: rgba(30, 41, 59, 0.9); /* 10% transparency */
+    border-radius: 12px;
+}
+QTextEdit#emailContent, QTextEdit#emailEditor {
+    background-color: rgba(30, 41, 59, 0.9); /* 10% transparency */
+    color: #F8FAFC;
+    border: none;
+    border-radius: 12px;
+}
+QTextEdit#emailEditor {
+    border: 1px solid #334155;
+    padding: 8px;
+}
+QPushButton#primaryBtn, QPushButton#secondaryBtn, QPushButton#attachBtn {
+    color: #F8FAFC;
+    border: none;
+    border-radius: 12px;
+    padding: 8px 16px;
+}
+QPushButton#primaryBtn {
+    background-color: #3B82F6;
+}
+QPushButton#primaryBtn:hover {
+    background-color: #2563EB;
+}
+QPushButton#secondaryBtn {
+    background-color: #475569;
+}
+QPushButton#secondaryBtn:hover {
+    background-color: #64748B;
+}
+QPushButton#attachBtn {
+    background-color: #334155;
+}
+QPushButton#attachBtn:hover {
+    background-color: #475569;
+}
+QLabel#errorLabel {
+    color: #EF4444;
+}
+"""
+
+# Sending accounts offered by the compose dialog
+EMAIL_ACCOUNTS = (
+    "contact@novamodelisapp.com",
+    "support@novamodelisapp.com",
+    "purchasing@novamodelisapp.com",
+)
+
+# Subject prefix of a reply, in any case and in its English or French form
+REPLY_PREFIX = re.compile(r"^\s*(re|rép)\s*:", re.IGNORECASE)
+
+# Reply body quoting the original email
+QUOTED_REPLY_TEMPLATE = (
+    "<br><br>Le {date}, {name} a écrit:<br>"
+    "<blockquote style='border-left: 2px solid #3B82F6; padding-left: 10px; color: #94A3B8;'>"
+    "{body}"
+    "</blockquote>"
+)
 
+# Markup Qt's HTML writer only emits for a body carrying formatting beyond plain paragraphs
+FORMATTING_MARKERS = ("<span style", "<img", "<a href", "<table", "<ul", "<ol")
 
-class SupplierEmailViewDialog(QDialog):
+
+def set_text(widget, text):
+    """Set a label's or line edit's text, skipping the relayout and repaint if it is unchanged."""
+    if widget.text() != text:
+        widget.setText(text)
+
+
+def looks_unformatted(document_html):
+    """Return True if the HTML written by QTextEdit.toHtml() holds nothing but plain paragraphs."""
+    return not any(marker in document_html for marker in FORMATTING_MARKERS)
+
+
+class SupplierEmailViewDialog(DraggableDialog):
     """
     Dialog for viewing a supplier email.
     """
-    def __init__(self, email=None, parent=None):
-        # For window dragging
-        self.dragging = False
-        self.drag_position = None
-        
+    def __init__(self, email=None, parent=None, supplier=None, compose_form=None):
         super().__init__(parent)
         
         self.email = email
-        
-        # Remove window frame and title bar
-        self.setWindowFlags(Qt.Dialog | Qt.FramelessWindowHint)
-        
-        # Set window transparency
-        self.setWindowOpacity(0.9)  # 10% transparency
+        # Supplier's (company_name, email) row when already fetched by the caller
+        self.supplier = supplier
+        # Callable returning a compose dialog prepared for a reply, when the caller reuses one
+        self.compose_form = compose_form
+        # Whether a reply was sent from this dialog, so the caller can refresh its messages
+        self.reply_sent = False
         
         self.setMinimumSize(700, 500)
         
@@ -49,31 +143,6 @@ class SupplierEmailViewDialog(QDialog):
         if self.email:
             self.load_email_data()
     
-    def mousePressEvent(self, event):
-        """
-        Handle mouse press event for window dragging.
-        """
-        if event.button() == Qt.LeftButton:
-            self.dragging = True
-            self.drag_position = event.globalPosition().toPoint() - self.frameGeometry().topLeft()
-            event.accept()
-    
-    def mouseMoveEvent(self, event):
-        """
-        Handle mouse move event for window dragging.
-        """
-        if event.buttons() & Qt.LeftButton and self.dragging:
-            self.move(event.globalPosition().toPoint() - self.drag_position)
-            event.accept()
-    
-    def mouseReleaseEvent(self, event):
-        """
-        Handle mouse release event for window dragging.
-        """
-        if event.button() == Qt.LeftButton:
-            self.dragging = False
-            event.accept()
-    
     def setup_ui(self):
         """
         Set up the user interface.
@@ -89,26 +158,13 @@ class SupplierEmailViewDialog(QDialog):
         
         # Title
         title_label = QLabel("Voir Email")
-        title_label.setStyleSheet("color: #F8FAFC; font-size: 18px; font-weight: bold;")
+        title_label.setObjectName("titleLabel")
         
         # Close button
         close_btn = QPushButton("×")  # Unicode multiplication sign as close icon
         close_btn.setFixedSize(30, 30)
         close_btn.setCursor(Qt.PointingHandCursor)
-        close_btn.setStyleSheet("""
-            QPushButton {
-                background-color: transparent;
-                color: #94A3B8;
-                font-size: 20px;
-                font-weight: bold;
-                border: none;
-                border-radius: 15px;
-            }
-            QPushButton:hover {
-                background-color: #EF4444;
-                color: #F8FAFC;
-            }
-        """)
+        close_btn.setObjectName("closeBtn")
         close_btn.clicked.connect(self.reject)
         
         title_bar_layout.addWidget(title_label)
@@ -120,12 +176,6 @@ class SupplierEmailViewDialog(QDialog):
         # Email header
         header_frame = QFrame()
         header_frame.setObjectName("headerFrame")
-        header_frame.setStyleSheet("""
-            #headerFrame {
-                background-color: rgba(30, 41, 59, 0.9); /* 10% transparency */
-                border-radius: 12px;
-            }
-        """)
         
         header_layout = QVBoxLayout(header_frame)
         header_layout.setContentsMargins(15, 15, 15, 15)
@@ -133,17 +183,17 @@ class SupplierEmailViewDialog(QDialog):
         
         # Subject
         self.subject_label = QLabel()
-        self.subject_label.setStyleSheet("color: #F8FAFC; font-size: 18px; font-weight: bold;")
+        self.subject_label.setObjectName("subjectLabel")
         header_layout.addWidget(self.subject_label)
         
         # From/To
         from_to_layout = QHBoxLayout()
         
         self.from_label = QLabel()
-        self.from_label.setStyleSheet("color: #94A3B8;")
+        self.from_label.setObjectName("headerLabel")
         
         self.to_label = QLabel()
-        self.to_label.setStyleSheet("color: #94A3B8;")
+        self.to_label.setObjectName("headerLabel")
         
         from_to_layout.addWidget(self.from_label)
         from_to_layout.addStretch()
@@ -155,7 +205,7 @@ class SupplierEmailViewDialog(QDialog):
         date_layout = QHBoxLayout()
         
         self.date_label = QLabel()
-        self.date_label.setStyleSheet("color: #94A3B8;")
+        self.date_label.setObjectName("headerLabel")
         
         date_layout.addWidget(self.date_label)
         date_layout.addStretch()
@@ -167,12 +217,6 @@ class SupplierEmailViewDialog(QDialog):
         # Email content
         content_frame = QFrame()
         content_frame.setObjectName("contentFrame")
-        content_frame.setStyleSheet("""
-            #contentFrame {
-                background-color: rgba(30, 41, 59, 0.9); /* 10% transparency */
-                border-radius: 12px;
-            }
-        """)
         
         content_layout = QVBoxLayout(content_frame)
         content_layout.setContentsMargins(15, 15, 15, 15)
@@ -180,14 +224,7 @@ class SupplierEmailViewDialog(QDialog):
         
         self.content_text = QTextEdit()
         self.content_text.setReadOnly(True)
-        self.content_text.setStyleSheet("""
-            QTextEdit {
-                background-color: rgba(30, 41, 59, 0.9); /* 10% transparency */
-                color: #F8FAFC;
-                border: none;
-                border-radius: 12px;
-            }
-        """)
+        self.content_text.setObjectName("emailContent")
         
         content_layout.addWidget(self.content_text)
         
@@ -198,36 +235,14 @@ class SupplierEmailViewDialog(QDialog):
         buttons_layout.setSpacing(10)
         
         self.reply_btn = QPushButton("Répondre")
-        self.reply_btn.setIcon(QIcon("src/resources/icons/reply.png"))
+        self.reply_btn.setIcon(cached_icon("src/resources/icons/reply.png"))
         self.reply_btn.setCursor(Qt.PointingHandCursor)
-        self.reply_btn.setStyleSheet("""
-            QPushButton {
-                background-color: #3B82F6;
-                color: #F8FAFC;
-                border: none;
-                border-radius: 12px;
-                padding: 8px 16px;
-            }
-            QPushButton:hover {
-                background-color: #2563EB;
-            }
-        """)
+        self.reply_btn.setObjectName("primaryBtn")
         self.reply_btn.clicked.connect(self.reply_to_email)
         
         self.close_btn = QPushButton("Fermer")
         self.close_btn.setCursor(Qt.PointingHandCursor)
-        self.close_btn.setStyleSheet("""
-            QPushButton {
-                background-color: #475569;
-                color: #F8FAFC;
-                border: none;
-                border-radius: 12px;
-                padding: 8px 16px;
-            }
-            QPushButton:hover {
-                background-color: #64748B;
-            }
-        """)
+        self.close_btn.setObjectName("secondaryBtn")
         self.close_btn.clicked.connect(self.reject)
         
         buttons_layout.addWidget(self.reply_btn)
@@ -235,6 +250,9 @@ class SupplierEmailViewDialog(QDialog):
         buttons_layout.addWidget(self.close_btn)
         
         main_layout.addLayout(buttons_layout)
+        
+        # Apply styles
+        self.setStyleSheet(DIALOG_STYLESHEET)
     
     def load_email_data(self):
         """
@@ -244,43 +262,46 @@ class SupplierEmailViewDialog(QDialog):
             return
         
         # Set subject
-        self.subject_label.setText(self.email.subject)
+        set_text(self.subject_label, self.email.subject)
         
-        # Set from/to
+        # Look up the supplier and mark the email as read within a single session
+        supplier_name = "Inconnu"
+        supplier_address = ""
         try:
-            db = SessionLocal()
-            supplier = db.query(Supplier).filter(Supplier.id == self.email.supplier_id).first()
-            supplier_name = f"{supplier.company_name}" if supplier else "Inconnu"
-            
-            if self.email.is_incoming:
-                self.from_label.setText(f"De: {supplier_name} <{supplier.email}>")
-                self.to_label.setText(f"À: NovaModelis")
-            else:
-                self.from_label.setText(f"De: NovaModelis")
-                self.to_label.setText(f"À: {supplier_name} <{supplier.email}>")
+            with SessionLocal() as db:
+                supplier = self.supplier
+                if supplier is None:
+                    # Only the supplier's name and address are needed, not the whole row
+                    supplier = db.query(Supplier.company_name, Supplier.email).filter(
+                        Supplier.id == self.email.supplier_id
+                    ).first()
+                
+                if supplier:
+                    supplier_name = f"{supplier.company_name}"
+                    supplier_address = f" <{supplier.email}>"
+                
+                # Update email status to read if it's unread, without loading the email again
+                if self.email.is_incoming and self.email.status == EmailStatus.UNREAD:
+                    db.query(SupplierEmail).filter(SupplierEmail.id == self.email.id).update(
+                        {SupplierEmail.status: EmailStatus.READ}, synchronize_session=False
+                    )
+                    db.commit()
         except Exception as e:
-            logging.error(f"Error loading supplier data: {str(e)}")
-        finally:
-            db.close()
+            logging.error(f"Error loading email data: {str(e)}")
+        
+        # Set from/to
+        if self.email.is_incoming:
+            set_text(self.from_label, f"De: {supplier_name}{supplier_address}")
+            set_text(self.to_label, f"À: NovaModelis")
+        else:
+            set_text(self.from_label, f"De: NovaModelis")
+            set_text(self.to_label, f"À: {supplier_name}{supplier_address}")
         
         # Set date
-        self.date_label.setText(f"Date: {self.email.received_at.strftime('%d %b %Y %H:%M')}")
-        
-        # Set content
-        self.content_text.setHtml(self.email.body)
-        
-        # Update email status to read if it's unread
-        if self.email.is_incoming and self.email.status == EmailStatus.UNREAD:
-            try:
-                db = SessionLocal()
-                email = db.query(SupplierEmail).filter(SupplierEmail.id == self.email.id).first()
-                if email:
-                    email.status = EmailStatus.READ
-                    db.commit()
-            except Exception as e:
-                logging.error(f"Error updating email status: {str(e)}")
-            finally:
-                db.close()
+        set_text(self.date_label, f"Date: {self.email.received_at.strftime('%d %b %Y %H:%M')}")
+        
+        # Set content on the next event loop pass, so the dialog is shown before the HTML is parsed
+        QTimer.singleShot(0, functools.partial(self.content_text.setHtml, self.email.body))
     
     def reply_to_email(self):
         """
@@ -290,42 +311,31 @@ class SupplierEmailViewDialog(QDialog):
             return
         
         try:
-            db = SessionLocal()
-            supplier = db.query(Supplier).filter(Supplier.id == self.email.supplier_id).first()
+            # The session is closed before the compose dialog is shown
+            with SessionLocal() as db:
+                supplier = db.query(Supplier).filter(Supplier.id == self.email.supplier_id).first()
             
             if supplier:
-                compose_dialog = SupplierEmailComposeDialog(
-                    parent=self.parent(),
-                    reply_to=self.email,
-                    supplier=supplier
-                )
-                compose_dialog.exec()
+                if self.compose_form is not None:
+                    compose_dialog = self.compose_form(reply_to=self.email, supplier=supplier)
+                else:
+                    compose_dialog = SupplierEmailComposeDialog(self, reply_to=self.email, supplier=supplier)
+                if compose_dialog.exec():
+                    self.reply_sent = True
         except Exception as e:
             logging.error(f"Error preparing reply: {str(e)}")
-        finally:
-            db.close()
 
 
-class SupplierEmailComposeDialog(QDialog):
+class SupplierEmailComposeDialog(DraggableDialog):
     """
     Dialog for composing a supplier email.
     """
     def __init__(self, parent=None, reply_to=None, supplier=None):
-        # For window dragging
-        self.dragging = False
-        self.drag_position = None
-        
         super().__init__(parent)
         
         self.reply_to = reply_to
         self.supplier = supplier
         
-        # Remove window frame and title bar
-        self.setWindowFlags(Qt.Dialog | Qt.FramelessWindowHint)
-        
-        # Set window transparency
-        self.setWindowOpacity(0.9)  # 10% transparency
-        
         self.setFixedSize(700, 600)
         
         self.setup_ui()
@@ -333,31 +343,6 @@ class SupplierEmailComposeDialog(QDialog):
         if reply_to and supplier:
             self.prepare_reply()
     
-    def mousePressEvent(self, event):
-        """
-        Handle mouse press event for window dragging.
-        """
-        if event.button() == Qt.LeftButton:
-            self.dragging = True
-            self.drag_position = event.globalPosition().toPoint() - self.frameGeometry().topLeft()
-            event.accept()
-    
-    def mouseMoveEvent(self, event):
-        """
-        Handle mouse move event for window dragging.
-        """
-        if event.buttons() & Qt.LeftButton and self.dragging:
-            self.move(event.globalPosition().toPoint() - self.drag_position)
-            event.accept()
-    
-    def mouseReleaseEvent(self, event):
-        """
-        Handle mouse release event for window dragging.
-        """
-        if event.button() == Qt.LeftButton:
-            self.dragging = False
-            event.accept()
-    
     def setup_ui(self):
         """
         Set up the user interface.
@@ -372,30 +357,17 @@ class SupplierEmailComposeDialog(QDialog):
         title_bar_layout.setContentsMargins(0, 0, 0, 10)
         
         # Title
-        title_label = QLabel("Répondre à l'email" if self.reply_to else "Nouveau Email")
-        title_label.setStyleSheet("color: #F8FAFC; font-size: 18px; font-weight: bold;")
+        self.title_label = QLabel("Répondre à l'email" if self.reply_to else "Nouveau Email")
+        self.title_label.setObjectName("titleLabel")
         
         # Close button
         close_btn = QPushButton("×")  # Unicode multiplication sign as close icon
         close_btn.setFixedSize(30, 30)
         close_btn.setCursor(Qt.PointingHandCursor)
-        close_btn.setStyleSheet("""
-            QPushButton {
-                background-color: transparent;
-                color: #94A3B8;
-                font-size: 20px;
-                font-weight: bold;
-                border: none;
-                border-radius: 15px;
-            }
-            QPushButton:hover {
-                background-color: #EF4444;
-                color: #F8FAFC;
-            }
-        """)
+        close_btn.setObjectName("closeBtn")
         close_btn.clicked.connect(self.reject)
         
-        title_bar_layout.addWidget(title_label)
+        title_bar_layout.addWidget(self.title_label)
         title_bar_layout.addStretch()
         title_bar_layout.addWidget(close_btn)
         
@@ -426,15 +398,7 @@ class SupplierEmailComposeDialog(QDialog):
         # Email content
         self.content_text = QTextEdit()
         self.content_text.setMinimumHeight(300)
-        self.content_text.setStyleSheet("""
-            QTextEdit {
-                background-color: rgba(30, 41, 59, 0.9); /* 10% transparency */
-                color: #F8FAFC;
-                border: 1px solid #334155;
-                border-radius: 12px;
-                padding: 8px;
-            }
-        """)
+        self.content_text.setObjectName("emailEditor")
         
         main_layout.addWidget(self.content_text)
         
@@ -442,20 +406,9 @@ class SupplierEmailComposeDialog(QDialog):
         attachments_layout = QHBoxLayout()
         
         self.attach_btn = QPushButton("Joindre un fichier")
-        self.attach_btn.setIcon(QIcon("src/resources/icons/attachment.png"))
+        self.attach_btn.setIcon(cached_icon("src/resources/icons/attachment.png"))
         self.attach_btn.setCursor(Qt.PointingHandCursor)
-        self.attach_btn.setStyleSheet("""
-            QPushButton {
-                background-color: #334155;
-                color: #F8FAFC;
-                border: none;
-                border-radius: 12px;
-                padding: 8px 16px;
-            }
-            QPushButton:hover {
-                background-color: #475569;
-            }
-        """)
+        self.attach_btn.setObjectName("attachBtn")
         self.attach_btn.clicked.connect(self.attach_file)
         
         attachments_layout.addWidget(self.attach_btn)
@@ -463,41 +416,25 @@ class SupplierEmailComposeDialog(QDialog):
         
         main_layout.addLayout(attachments_layout)
         
+        # Validation errors, shown inline rather than in a message box
+        self.error_label = QLabel()
+        self.error_label.setObjectName("errorLabel")
+        self.error_label.hide()
+        main_layout.addWidget(self.error_label)
+        
         # Buttons
         buttons_layout = QHBoxLayout()
         buttons_layout.setSpacing(10)
         
         self.send_btn = QPushButton("Envoyer")
-        self.send_btn.setIcon(QIcon("src/resources/icons/send.png"))
+        self.send_btn.setIcon(cached_icon("src/resources/icons/send.png"))
         self.send_btn.setCursor(Qt.PointingHandCursor)
-        self.send_btn.setStyleSheet("""
-            QPushButton {
-                background-color: #3B82F6;
-                color: #F8FAFC;
-                border: none;
-                border-radius: 12px;
-                padding: 8px 16px;
-            }
-            QPushButton:hover {
-                background-color: #2563EB;
-            }
-        """)
+        self.send_btn.setObjectName("primaryBtn")
         self.send_btn.clicked.connect(self.send_email)
         
         self.cancel_btn = QPushButton("Annuler")
         self.cancel_btn.setCursor(Qt.PointingHandCursor)
-        self.cancel_btn.setStyleSheet("""
-            QPushButton {
-                background-color: #475569;
-                color: #F8FAFC;
-                border: none;
-                border-radius: 12px;
-                padding: 8px 16px;
-            }
-            QPushButton:hover {
-                background-color: #64748B;
-            }
-        """)
+        self.cancel_btn.setObjectName("secondaryBtn")
         self.cancel_btn.clicked.connect(self.reject)
         
         buttons_layout.addStretch()
@@ -505,16 +442,35 @@ class SupplierEmailComposeDialog(QDialog):
         buttons_layout.addWidget(self.send_btn)
         
         main_layout.addLayout(buttons_layout)
+        
+        # Apply styles
+        self.setStyleSheet(DIALOG_STYLESHEET)
+    
+    def reset(self, reply_to=None, supplier=None):
+        """
+        Clear the form so the dialog can be shown again for another email or reply.
+        """
+        self.reply_to = reply_to
+        self.supplier = supplier
+        
+        set_text(self.title_label, "Répondre à l'email" if reply_to else "Nouveau Email")
+        self.from_combo.setCurrentIndex(0)
+        self.to_input.setReadOnly(False)
+        set_text(self.to_input, supplier.email if supplier else "")
+        self.subject_input.clear()
+        self.content_text.clear()
+        self.error_label.hide()
+        
+        if reply_to and supplier:
+            self.prepare_reply()
     
     def load_email_accounts(self):
         """
         Load email accounts into the combo box.
         """
         # In a real application, this would load from a configuration or database
-        # For this demo, we'll add some sample accounts
-        self.from_combo.addItem("contact@novamodelisapp.com", "contact@novamodelisapp.com")
-        self.from_combo.addItem("support@novamodelisapp.com", "support@novamodelisapp.com")
-        self.from_combo.addItem("purchasing@novamodelisapp.com", "purchasing@novamodelisapp.com")
+        # For this demo, we'll add some sample accounts, all in one call
+        self.from_combo.addItems(EMAIL_ACCOUNTS)
     
     def attach_file(self):
         """
@@ -532,21 +488,20 @@ class SupplierEmailComposeDialog(QDialog):
             return
         
         # Set recipient
-        self.to_input.setText(self.supplier.email)
+        set_text(self.to_input, self.supplier.email)
         self.to_input.setReadOnly(True)
         
         # Set subject with Re: prefix if not already present
         subject = self.reply_to.subject
-        if not subject.startswith("Re:"):
+        if not REPLY_PREFIX.match(subject):
             subject = f"Re: {subject}"
         self.subject_input.setText(subject)
         
         # Set content with quote of original email
         original_date = self.reply_to.received_at.strftime("%d %b %Y %H:%M")
-        quoted_content = f"<br><br>Le {original_date}, {self.supplier.company_name} a écrit:<br>"
-        quoted_content += f"<blockquote style='border-left: 2px solid #3B82F6; padding-left: 10px; color: #94A3B8;'>"
-        quoted_content += f"{self.reply_to.body}"
-        quoted_content += "</blockquote>"
+        quoted_content = QUOTED_REPLY_TEMPLATE.format(
+            date=original_date, name=self.supplier.company_name, body=self.reply_to.body
+        )
         
         self.content_text.setHtml(quoted_content)
         
@@ -556,62 +511,72 @@ class SupplierEmailComposeDialog(QDialog):
         self.content_text.setTextCursor(cursor)
         self.content_text.setFocus()
     
+    def show_error(self, text):
+        """
+        Show a validation error below the form.
+        """
+        set_text(self.error_label, text)
+        self.error_label.show()
+    
     def send_email(self):
         """
         Send the email.
         """
         # Validate required fields
-        from_email = self.from_combo.currentData()
+        from_email = self.from_combo.currentText()
         to_email = self.to_input.text().strip()
         subject = self.subject_input.text().strip()
+        plain_content = self.content_text.toPlainText()
         content = self.content_text.toHtml()
+        # Store plain text as minimal HTML rather than Qt's full document markup
+        if looks_unformatted(content):
+            content = html.escape(plain_content).replace("\n", "<br>")
         
         if not to_email:
-            QMessageBox.warning(self, "Erreur de validation", "Le destinataire est requis.")
+            self.show_error("Le destinataire est requis.")
             return
         
         if not subject:
-            QMessageBox.warning(self, "Erreur de validation", "Le sujet est requis.")
+            self.show_error("Le sujet est requis.")
             return
         
-        if not content:
-            QMessageBox.warning(self, "Erreur de validation", "Le contenu est requis.")
+        if not plain_content.strip():
+            self.show_error("Le contenu est requis.")
             return
         
         try:
-            db = SessionLocal()
-            
-            # Get supplier ID
-            supplier_id = None
-            if self.supplier:
-                supplier_id = self.supplier.id
-            else:
-                # Try to find supplier by email
-                supplier = db.query(Supplier).filter(Supplier.email == to_email).first()
-                if supplier:
-                    supplier_id = supplier.id
-            
-            # Create new email
-            email = SupplierEmail()
-            email.supplier_id = supplier_id
-            email.subject = subject
-            email.body = content
-            email.is_incoming = False
-            email.status = EmailStatus.SENT
-            email.received_at = datetime.datetime.utcnow()
-            email.created_at = datetime.datetime.utcnow()
-            email.updated_at = datetime.datetime.utcnow()
-            
-            db.add(email)
-            db.commit()
+            with SessionLocal() as db:
+                # Get supplier ID
+                supplier_id = None
+                if self.supplier:
+                    supplier_id = self.supplier.id
+                else:
+                    # Try to find supplier by email
+                    supplier = db.query(Supplier).filter(Supplier.email == to_email).first()
+                    if supplier:
+                        supplier_id = supplier.id
+                
+                # Insert the new email directly, without an ORM object to track,
+                # its timestamps all set to the same instant
+                now = datetime.datetime.utcnow()
+                db.execute(insert(SupplierEmail).values(
+                    supplier_id=supplier_id,
+                    subject=subject,
+                    body=content,
+                    is_incoming=False,
+                    status=EmailStatus.SENT,
+                    received_at=now,
+                    created_at=now,
+                    updated_at=now
+                ))
+                db.commit()
             
             logging.info(f"Email sent to supplier {to_email}")
             
+            self.error_label.hide()
             QMessageBox.information(self, "Email envoyé", "L'email a été envoyé avec succès.")
             
             self.accept()
         except Exception as e:
             logging.error(f"Error sending email: {str(e)}")
             QMessageBox.warning(self, "Erreur", f"Une erreur est survenue: {str(e)}")
-        finally:
-            db.close()
@@ -1,49 +1,104 @@
 """
 Suppliers view for the application.
 """
-import os
-import sys
 import logging
-import datetime
 from PySide6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, 
-    QFrame, QGridLayout, QScrollArea, QTableWidget, QTableWidgetItem,
-    QHeaderView, QSizePolicy, QDialog, QLineEdit, QFormLayout,
-    QComboBox, QMessageBox, QSpinBox, QDoubleSpinBox, QTextEdit
+    QFrame, QGridLayout, QScrollArea,
+    QHeaderView, QSizePolicy, QLineEdit, QFormLayout,
+    QComboBox, QMessageBox, QSpinBox, QDoubleSpinBox, QTextEdit, QTableView
 )
-from PySide6.QtCore import Qt, Signal, Slot, QSize
-from PySide6.QtGui import QIcon, QFont, QColor, QPainter
-
-# Add the parent directory to sys.path to allow imports
-sys.path.insert(0, os.path.abspath(os.path.dirname(__file__) + '/../..'))
+from PySide6.QtCore import (
+    Qt, Signal, Slot, QTimer, QObject, QRunnable, QThreadPool,
+    QSortFilterProxyModel
+)
+from PySide6.QtGui import QFont, QColor, QStandardItemModel, QStandardItem
+from sqlalchemy import select, delete, bindparam, func, literal
 
 from database.base import SessionLocal
 from models import Supplier, SupplierEmail, EmailStatus
+from views.common import CLOSE_BUTTON_STYLESHEET, DraggableDialog, IconButtonsDelegate, cached_icon
 from views.supplier_email_view import SupplierEmailComposeDialog, SupplierEmailViewDialog
 import config
 
 
-class SupplierDetailsDialog(QDialog):
+def location_part(column):
+    """Return ', ' followed by the column in SQL, or '' when the column is NULL or empty."""
+    return func.coalesce(literal(", ") + func.nullif(column, ""), "")
+
+
+# Columns read for the suppliers table; the rows come back as lightweight named tuples,
+# without ORM objects, identity map entries or the unused address and notes columns.
+# The location is joined in SQL, as "city, state, country" without the missing parts
+# (concat_ws is not available in older SQLite versions)
+SUPPLIER_COLUMNS = (
+    Supplier.id, Supplier.company_name, Supplier.contact_name, Supplier.email, Supplier.phone,
+    func.substr(
+        location_part(Supplier.city) + location_part(Supplier.state_province)
+        + location_part(Supplier.country),
+        3
+    ).label("location")
+)
+
+# ID of the supplier holding an email address, built once and bound to each address checked
+SUPPLIER_ID_BY_EMAIL = select(Supplier.id).where(Supplier.email == bindparam("email"))
+
+# Latest emails for the messages table, with only the columns it shows and their supplier's
+# name; the outer join keeps emails whose supplier no longer exists
+RECENT_MESSAGES = select(
+    SupplierEmail.id, SupplierEmail.supplier_id, SupplierEmail.subject,
+    SupplierEmail.received_at, SupplierEmail.status, Supplier.company_name
+).outerjoin(
+    Supplier, Supplier.id == SupplierEmail.supplier_id
+).order_by(SupplierEmail.received_at.desc()).limit(10)
+
+# Text of each status in the messages table
+MESSAGE_STATUS_TEXTS = {status: status.value.capitalize() for status in EmailStatus}
+MESSAGE_STATUS_TEXTS[EmailStatus.UNREAD] = "Nouveau"
+
+# Fill of the painted action buttons of the suppliers and messages tables
+ACTION_BUTTON_COLOR = QColor("#334155")
+
+# Stylesheet shared by the suppliers and messages tables
+TABLE_STYLESHEET = """
+QTableView {
+    background-color: #1E293B;
+    border-radius: 8px;
+    border: none;
+    gridline-color: #334155;
+}
+QHeaderView::section {
+    background-color: #0F172A;
+    color: #94A3B8;
+    border: none;
+    padding: 5px;
+}
+QTableView::item {
+    color: #F8FAFC;
+    border: none;
+    padding: 5px;
+}
+QTableView::item:selected {
+    background-color: #334155;
+}
+"""
+
+
+class SupplierDetailsDialog(DraggableDialog):
     """
     Dialog for viewing and editing supplier details.
     """
-    def __init__(self, supplier=None, parent=None, read_only=False):
-        # For window dragging
-        self.dragging = False
-        self.drag_position = None
-        
+    # Rendered opaque, so the compositor does not blend the window while it is dragged
+    WINDOW_OPACITY = 1.0
+    
+    def __init__(self, db, supplier=None, parent=None, read_only=False):
         super().__init__(parent)
         
+        self.db = db
         self.supplier = supplier
         self.is_edit_mode = supplier is not None
         self.read_only = read_only
         
-        # Remove window frame and title bar
-        self.setWindowFlags(Qt.Dialog | Qt.FramelessWindowHint)
-        
-        # Set window transparency
-        self.setWindowOpacity(0.9)  # 10% transparency
-        
         self.setMinimumSize(500, 600)
         
         self.setup_ui()
@@ -55,31 +110,6 @@ class SupplierDetailsDialog(QDialog):
         if self.read_only:
             self.set_read_only()
     
-    def mousePressEvent(self, event):
-        """
-        Handle mouse press event for window dragging.
-        """
-        if event.button() == Qt.LeftButton:
-            self.dragging = True
-            self.drag_position = event.globalPosition().toPoint() - self.frameGeometry().topLeft()
-            event.accept()
-    
-    def mouseMoveEvent(self, event):
-        """
-        Handle mouse move event for window dragging.
-        """
-        if event.buttons() & Qt.LeftButton and self.dragging:
-            self.move(event.globalPosition().toPoint() - self.drag_position)
-            event.accept()
-    
-    def mouseReleaseEvent(self, event):
-        """
-        Handle mouse release event for window dragging.
-        """
-        if event.button() == Qt.LeftButton:
-            self.dragging = False
-            event.accept()
-    
     def set_read_only(self):
         """
         Set all inputs to read-only mode.
@@ -154,20 +184,7 @@ class SupplierDetailsDialog(QDialog):
         close_btn = QPushButton("×")  # Unicode multiplication sign as close icon
         close_btn.setFixedSize(30, 30)
         close_btn.setCursor(Qt.PointingHandCursor)
-        close_btn.setStyleSheet("""
-            QPushButton {
-                background-color: transparent;
-                color: #94A3B8;
-                font-size: 20px;
-                font-weight: bold;
-                border: none;
-                border-radius: 15px;
-            }
-            QPushButton:hover {
-                background-color: #EF4444;
-                color: #F8FAFC;
-            }
-        """)
+        close_btn.setStyleSheet(CLOSE_BUTTON_STYLESHEET)
         close_btn.clicked.connect(self.reject)
         
         title_bar_layout.addWidget(title_label)
@@ -306,25 +323,24 @@ class SupplierDetailsDialog(QDialog):
             QMessageBox.warning(self, "Erreur de validation", "L'email est requis.")
             return
         
+        # The view's session is reused, rather than opening a new one for every save
+        db = self.db
         try:
-            db = SessionLocal()
-            
             # Check if email is already in use
-            existing_supplier = db.query(Supplier).filter(Supplier.email == email).first()
-            if existing_supplier and (not self.is_edit_mode or existing_supplier.id != self.supplier.id):
+            existing_supplier_id = db.execute(SUPPLIER_ID_BY_EMAIL, {"email": email}).scalar()
+            if existing_supplier_id is not None and (not self.is_edit_mode or existing_supplier_id != self.supplier.id):
                 QMessageBox.warning(self, "Erreur de validation", "Cet email est déjà utilisé.")
                 return
             
             if self.is_edit_mode:
                 # Update existing supplier
-                supplier = db.query(Supplier).filter(Supplier.id == self.supplier.id).first()
+                supplier = db.get(Supplier, self.supplier.id)
                 if not supplier:
                     QMessageBox.warning(self, "Erreur", "Fournisseur non trouvé.")
                     return
             else:
                 # Create new supplier
                 supplier = Supplier()
-                supplier.created_at = datetime.datetime.utcnow()
                 db.add(supplier)
             
             # Update supplier data
@@ -340,7 +356,7 @@ class SupplierDetailsDialog(QDialog):
             supplier.postal_code = self.postal_code_input.text().strip() or None
             supplier.country = self.country_input.text().strip() or None
             supplier.notes = self.notes_input.toPlainText().strip() or None
-            supplier.updated_at = datetime.datetime.utcnow()
+            # created_at and updated_at are set by the database, see the Supplier model
             
             db.commit()
             
@@ -348,10 +364,65 @@ class SupplierDetailsDialog(QDialog):
             
             self.accept()
         except Exception as e:
+            db.rollback()
             logging.error(f"Error saving supplier: {str(e)}")
             QMessageBox.warning(self, "Erreur", f"Une erreur est survenue: {str(e)}")
-        finally:
-            db.close()
+
+
+class SupplierLookupSignals(QObject):
+    """Signals handing a supplier looked up by a SupplierLookupTask to the GUI thread."""
+    # Supplier ID, then its (company_name, email) row, or None if it no longer exists
+    found = Signal(int, object)
+
+
+class SupplierLookupTask(QRunnable):
+    """Background task fetching the supplier of a message before it is opened."""
+    def __init__(self, supplier_id, parent=None):
+        super().__init__()
+        
+        self.supplier_id = supplier_id
+        # Owned by the parent widget so it outlives the task until its signal is delivered
+        self.signals = SupplierLookupSignals(parent)
+    
+    def run(self):
+        """Look the supplier up in its own session and report it."""
+        supplier = None
+        try:
+            # The view's session must not be used outside the GUI thread
+            with SessionLocal() as db:
+                supplier = db.query(Supplier.company_name, Supplier.email).filter(
+                    Supplier.id == self.supplier_id
+                ).first()
+        except Exception as e:
+            logging.error(f"Error prefetching supplier {self.supplier_id}: {str(e)}")
+        self.signals.found.emit(self.supplier_id, supplier)
+
+
+class MessagesLoadSignals(QObject):
+    """Signals handing the messages loaded by a MessagesLoadTask to the GUI thread."""
+    # Number of the refresh that started the task, then the RECENT_MESSAGES rows
+    loaded = Signal(int, object)
+
+
+class MessagesLoadTask(QRunnable):
+    """Background task loading the latest supplier emails for the messages table."""
+    def __init__(self, request, parent=None):
+        super().__init__()
+        
+        self.request = request
+        # Owned by the parent widget so it outlives the task until its signal is delivered
+        self.signals = MessagesLoadSignals(parent)
+    
+    def run(self):
+        """Load the messages in their own session and report them."""
+        emails = None
+        try:
+            # The view's session must not be used outside the GUI thread
+            with SessionLocal() as db:
+                emails = db.execute(RECENT_MESSAGES).all()
+        except Exception as e:
+            logging.error(f"Error loading messages: {str(e)}")
+        self.signals.loaded.emit(self.request, emails)
 
 
 class SuppliersView(QWidget):
@@ -362,6 +433,16 @@ class SuppliersView(QWidget):
         super().__init__()
         
         self.db = db
+        # Compose dialog, built on first use and reused for every new email or reply
+        self.compose_dialog = None
+        # Suppliers of the messages hovered or selected, fetched ahead of opening them
+        self.prefetched_suppliers = {}
+        self.pending_supplier_lookups = set()
+        # Number of the latest messages refresh; the results of older ones are dropped
+        self.messages_request = 0
+        # Font of the unread messages, shared by all their cells
+        self.unread_font = QFont()
+        self.unread_font.setBold(True)
         
         self.setup_ui()
         self.refresh_data()
@@ -396,13 +477,18 @@ class SuppliersView(QWidget):
                 padding: 8px;
             }
         """)
-        self.search_input.textChanged.connect(self.filter_suppliers)
+        # Filter once typing pauses for 150 ms rather than on every keystroke
+        self.filter_timer = QTimer(self)
+        self.filter_timer.setSingleShot(True)
+        self.filter_timer.setInterval(150)
+        self.filter_timer.timeout.connect(self.filter_suppliers)
+        self.search_input.textChanged.connect(lambda text: self.filter_timer.start())
         
         search_layout.addWidget(self.search_input)
         
         # Add supplier button
         self.add_btn = QPushButton("Ajouter un fournisseur")
-        self.add_btn.setIcon(QIcon("src/resources/icons/add_2.png"))
+        self.add_btn.setIcon(cached_icon("src/resources/icons/add_2.png"))
         self.add_btn.setCursor(Qt.PointingHandCursor)
         self.add_btn.setStyleSheet("""
             QPushButton {
@@ -427,39 +513,41 @@ class SuppliersView(QWidget):
         main_layout.addLayout(header_layout)
         
         # Suppliers table
-        self.suppliers_table = QTableWidget()
-        self.suppliers_table.setColumnCount(6)
-        self.suppliers_table.setHorizontalHeaderLabels([
+        self.suppliers_model = QStandardItemModel(0, 6, self)
+        self.suppliers_model.setHorizontalHeaderLabels([
             "Entreprise", "Contact", "Email", "Téléphone", "Localisation", "Actions"
         ])
+        
+        # The search filters the rows in Qt, on every column, without a Python scan
+        self.suppliers_proxy = QSortFilterProxyModel(self)
+        self.suppliers_proxy.setSourceModel(self.suppliers_model)
+        self.suppliers_proxy.setFilterKeyColumn(-1)
+        self.suppliers_proxy.setFilterCaseSensitivity(Qt.CaseInsensitive)
+        
+        self.suppliers_table = QTableView()
+        self.suppliers_table.setModel(self.suppliers_proxy)
         self.suppliers_table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
         self.suppliers_table.horizontalHeader().setDefaultAlignment(Qt.AlignLeft)
         self.suppliers_table.verticalHeader().setVisible(False)
-        self.suppliers_table.setSelectionBehavior(QTableWidget.SelectRows)
-        self.suppliers_table.setEditTriggers(QTableWidget.NoEditTriggers)
+        # Rows tall enough for the action icons, without a setRowHeight call per row
+        self.suppliers_table.verticalHeader().setDefaultSectionSize(40)
+        self.suppliers_table.setSelectionBehavior(QTableView.SelectRows)
+        self.suppliers_table.setEditTriggers(QTableView.NoEditTriggers)
         self.suppliers_table.setAlternatingRowColors(True)
-        self.suppliers_table.setStyleSheet("""
-            QTableWidget {
-                background-color: #1E293B;
-                border-radius: 8px;
-                border: none;
-                gridline-color: #334155;
-            }
-            QHeaderView::section {
-                background-color: #0F172A;
-                color: #94A3B8;
-                border: none;
-                padding: 5px;
-            }
-            QTableWidget::item {
-                color: #F8FAFC;
-                border: none;
-                padding: 5px;
-            }
-            QTableWidget::item:selected {
-                background-color: #334155;
-            }
-        """)
+        
+        # The action buttons are painted, not created as widgets for each row
+        self.supplier_actions = IconButtonsDelegate((
+            ("src/resources/icons/view.png", "Voir le fournisseur", self.view_supplier_by_id),
+            ("src/resources/icons/edit.png", "Modifier le fournisseur", self.edit_supplier_by_id),
+            ("src/resources/icons/delete.png", "Supprimer le fournisseur", self.delete_supplier_by_id),
+        ), self.suppliers_table, button_size=40, icon_size=24, spacing=5, button_color=ACTION_BUTTON_COLOR)
+        self.suppliers_table.setItemDelegateForColumn(5, self.supplier_actions)
+        # The actions column always holds the same three buttons, so give it a
+        # fixed width rather than stretching it with the text columns
+        self.suppliers_table.horizontalHeader().setSectionResizeMode(5, QHeaderView.Fixed)
+        self.suppliers_table.horizontalHeader().resizeSection(5, self.supplier_actions.cell_width())
+        
+        self.suppliers_table.setStyleSheet(TABLE_STYLESHEET)
         
         main_layout.addWidget(self.suppliers_table)
         
@@ -483,7 +571,7 @@ class SuppliersView(QWidget):
         
         # Compose email button
         compose_btn = QPushButton("Nouveau message")
-        compose_btn.setIcon(QIcon("src/resources/icons/email.png"))
+        compose_btn.setIcon(cached_icon("src/resources/icons/email.png"))
         compose_btn.setCursor(Qt.PointingHandCursor)
         compose_btn.setStyleSheet("""
             QPushButton {
@@ -506,39 +594,36 @@ class SuppliersView(QWidget):
         messages_layout.addLayout(messages_header)
         
         # Messages table
-        self.messages_table = QTableWidget()
-        self.messages_table.setColumnCount(5)
-        self.messages_table.setHorizontalHeaderLabels([
+        self.messages_model = QStandardItemModel(0, 5, self)
+        self.messages_model.setHorizontalHeaderLabels([
             "Fournisseur", "Sujet", "Date", "Statut", "Actions"
         ])
+        
+        self.messages_table = QTableView()
+        self.messages_table.setModel(self.messages_model)
         self.messages_table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
         self.messages_table.horizontalHeader().setDefaultAlignment(Qt.AlignLeft)
         self.messages_table.verticalHeader().setVisible(False)
-        self.messages_table.setSelectionBehavior(QTableWidget.SelectRows)
-        self.messages_table.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.messages_table.verticalHeader().setDefaultSectionSize(40)
+        self.messages_table.setSelectionBehavior(QTableView.SelectRows)
+        self.messages_table.setEditTriggers(QTableView.NoEditTriggers)
         self.messages_table.setAlternatingRowColors(True)
-        self.messages_table.setStyleSheet("""
-            QTableWidget {
-                background-color: #1E293B;
-                border-radius: 8px;
-                border: none;
-                gridline-color: #334155;
-            }
-            QHeaderView::section {
-                background-color: #0F172A;
-                color: #94A3B8;
-                border: none;
-                padding: 5px;
-            }
-            QTableWidget::item {
-                color: #F8FAFC;
-                border: none;
-                padding: 5px;
-            }
-            QTableWidget::item:selected {
-                background-color: #334155;
-            }
-        """)
+        
+        # The action buttons are painted, like the suppliers table's
+        self.message_actions = IconButtonsDelegate((
+            ("src/resources/icons/view.png", "Voir le message", self.view_message),
+            ("src/resources/icons/reply.png", "Répondre", self.reply_to_message),
+            ("src/resources/icons/delete.png", "Supprimer", self.delete_message),
+        ), self.messages_table, spacing=5, button_color=ACTION_BUTTON_COLOR)
+        self.messages_table.setItemDelegateForColumn(4, self.message_actions)
+        self.messages_table.horizontalHeader().setSectionResizeMode(4, QHeaderView.Fixed)
+        self.messages_table.horizontalHeader().resizeSection(4, self.message_actions.cell_width())
+        
+        # Fetch a message's supplier as soon as its row is hovered or selected
+        self.messages_table.setMouseTracking(True)
+        self.messages_table.entered.connect(self.prefetch_message_supplier)
+        self.messages_table.selectionModel().currentChanged.connect(self.prefetch_message_supplier)
+        self.messages_table.setStyleSheet(TABLE_STYLESHEET)
         
         messages_layout.addWidget(self.messages_table)
         
@@ -549,8 +634,11 @@ class SuppliersView(QWidget):
         Refresh the suppliers data.
         """
         try:
-            # Get all suppliers
-            suppliers = self.db.query(Supplier).all()
+            # Suppliers may have been edited or deleted since they were prefetched
+            self.prefetched_suppliers.clear()
+            
+            # Get all suppliers, with only the columns the table shows
+            suppliers = self.db.execute(select(*SUPPLIER_COLUMNS)).all()
             
             self.refresh_suppliers(suppliers)
             self.refresh_messages()
@@ -562,143 +650,71 @@ class SuppliersView(QWidget):
         Refresh the suppliers table.
         
         Args:
-            suppliers: List of suppliers to display.
+            suppliers: List of supplier rows, with the SUPPLIER_COLUMNS, to display.
         """
+        # Repaint once after all the rows rather than per change
+        self.suppliers_table.setUpdatesEnabled(False)
         try:
-            # Populate suppliers table
-            self.suppliers_table.setRowCount(len(suppliers))
+            model = self.suppliers_model
+            kept = min(model.rowCount(), len(suppliers))
             
-            # Set row height for better icon visibility
-            for i in range(len(suppliers)):
-                self.suppliers_table.setRowHeight(i, 40)
-                
-            for i, supplier in enumerate(suppliers):
-                # Company name
-                company_name_item = QTableWidgetItem(supplier.company_name)
-                self.suppliers_table.setItem(i, 0, company_name_item)
-                
-                # Contact name
-                contact_name_item = QTableWidgetItem(supplier.contact_name)
-                self.suppliers_table.setItem(i, 1, contact_name_item)
-                
-                # Email
-                email_item = QTableWidgetItem(supplier.email)
-                self.suppliers_table.setItem(i, 2, email_item)
-                
-                # Phone
-                phone_item = QTableWidgetItem(supplier.phone or "")
-                self.suppliers_table.setItem(i, 3, phone_item)
-                
-                # Location
-                location_parts = []
-                if supplier.city:
-                    location_parts.append(supplier.city)
-                if supplier.state_province:
-                    location_parts.append(supplier.state_province)
-                if supplier.country:
-                    location_parts.append(supplier.country)
-                
-                location_text = ", ".join(location_parts) if location_parts else ""
-                location_item = QTableWidgetItem(location_text)
-                self.suppliers_table.setItem(i, 4, location_item)
+            # Rows already in the table are updated in place, only where their text changed
+            for row in range(kept):
+                supplier = suppliers[row]
+                for column, text in enumerate(self.supplier_texts(supplier)):
+                    item = model.item(row, column)
+                    if item.text() != text:
+                        item.setText(text)
                 
-                # Actions
-                actions_widget = QWidget()
-                actions_layout = QHBoxLayout(actions_widget)
-                actions_layout.setContentsMargins(5, 0, 5, 0)
-                actions_layout.setSpacing(5)
-                
-                # Create a fixed copy of the supplier for this row
-                supplier_id = supplier.id
-                
-                # View button
-                view_btn = QPushButton()
-                view_btn.setIcon(QIcon("src/resources/icons/view.png"))
-                view_btn.setIconSize(QSize(24, 24))
-                view_btn.setFixedSize(40, 40)
-                view_btn.setStyleSheet("""
-                    QPushButton {
-                        background-color: #334155;
-                        border-radius: 15px;
-                        border: none;
-                    }
-                    QPushButton:hover {
-                        background-color: #475569;
-                    }
-                """)
-                view_btn.setToolTip("Voir le fournisseur")
-                view_btn.clicked.connect(lambda checked=False, id=supplier_id: self.view_supplier_by_id(id))
-                
-                # Edit button
-                edit_btn = QPushButton()
-                edit_btn.setIcon(QIcon("src/resources/icons/edit.png"))
-                edit_btn.setIconSize(QSize(24, 24))
-                edit_btn.setFixedSize(40, 40)
-                edit_btn.setStyleSheet("""
-                    QPushButton {
-                        background-color: #334155;
-                        border-radius: 15px;
-                        border: none;
-                    }
-                    QPushButton:hover {
-                        background-color: #475569;
-                    }
-                """)
-                edit_btn.setToolTip("Modifier le fournisseur")
-                edit_btn.clicked.connect(lambda checked=False, id=supplier_id: self.edit_supplier_by_id(id))
-                
-                # Delete button
-                delete_btn = QPushButton()
-                delete_btn.setIcon(QIcon("src/resources/icons/delete.png"))
-                delete_btn.setIconSize(QSize(24, 24))
-                delete_btn.setFixedSize(40, 40)
-                delete_btn.setStyleSheet("""
-                    QPushButton {
-                        background-color: #334155;
-                        border-radius: 15px;
-                        border: none;
-                    }
-                    QPushButton:hover {
-                        background-color: #475569;
-                    }
-                """)
-                delete_btn.setToolTip("Supprimer le fournisseur")
-                delete_btn.clicked.connect(lambda checked=False, id=supplier_id: self.delete_supplier_by_id(id))
-                
-                actions_layout.addWidget(view_btn)
-                actions_layout.addWidget(edit_btn)
-                actions_layout.addWidget(delete_btn)
-                actions_layout.addStretch()
+                actions_item = model.item(row, 5)
+                if actions_item.data(Qt.UserRole) != supplier.id:
+                    actions_item.setData(supplier.id, Qt.UserRole)
+            
+            # Drop the rows no longer needed
+            if model.rowCount() > len(suppliers):
+                model.removeRows(len(suppliers), model.rowCount() - len(suppliers))
+            
+            for supplier in suppliers[kept:]:
+                # Actions, identified by the supplier ID
+                actions_item = QStandardItem()
+                actions_item.setData(supplier.id, Qt.UserRole)
                 
-                self.suppliers_table.setCellWidget(i, 5, actions_widget)
+                # Each row is inserted complete, so the proxy filters it once rather than per cell
+                model.appendRow([QStandardItem(text) for text in self.supplier_texts(supplier)] + [actions_item])
             
             logging.info("Suppliers view refreshed")
         except Exception as e:
             logging.error(f"Error refreshing suppliers data: {str(e)}")
+        finally:
+            self.suppliers_table.setUpdatesEnabled(True)
+    
+    @staticmethod
+    def supplier_texts(supplier):
+        """
+        Return the texts of a supplier row's displayed columns, in column order.
+        
+        Args:
+            supplier: Supplier row, with the SUPPLIER_COLUMNS.
+        """
+        return (
+            supplier.company_name,
+            supplier.contact_name,
+            supplier.email,
+            supplier.phone or "",
+            supplier.location or "",
+        )
     
     def filter_suppliers(self):
         """
         Filter suppliers based on search text.
         """
-        search_text = self.search_input.text().lower()
-        
-        for i in range(self.suppliers_table.rowCount()):
-            row_hidden = True
-            
-            # Check if search text is in any of the first 5 columns
-            for j in range(5):
-                item = self.suppliers_table.item(i, j)
-                if item and search_text in item.text().lower():
-                    row_hidden = False
-                    break
-            
-            self.suppliers_table.setRowHidden(i, row_hidden)
+        self.suppliers_proxy.setFilterFixedString(self.search_input.text())
     
     def add_supplier(self):
         """
         Open the add supplier dialog.
         """
-        dialog = SupplierDetailsDialog(parent=self)
+        dialog = SupplierDetailsDialog(self.db, parent=self)
         if dialog.exec():
             # Refresh the view to show the new supplier
             self.refresh_data()
@@ -707,14 +723,14 @@ class SuppliersView(QWidget):
         """
         Open the view supplier dialog in read-only mode.
         """
-        dialog = SupplierDetailsDialog(supplier, self, read_only=True)
+        dialog = SupplierDetailsDialog(self.db, supplier, self, read_only=True)
         dialog.exec()
     
     def edit_supplier(self, supplier):
         """
         Open the edit supplier dialog.
         """
-        dialog = SupplierDetailsDialog(supplier, self)
+        dialog = SupplierDetailsDialog(self.db, supplier, self)
         if dialog.exec():
             # Refresh the view to show the updated supplier
             self.refresh_data()
@@ -732,8 +748,11 @@ class SuppliersView(QWidget):
         
         if reply == QMessageBox.Yes:
             try:
-                # Delete supplier
-                self.db.query(Supplier).filter(Supplier.id == supplier.id).delete()
+                # Delete the supplier and its emails with one DELETE statement each, in a
+                # single transaction; the emails are removed explicitly because SQLite only
+                # applies ON DELETE CASCADE when foreign keys are enforced
+                self.db.execute(delete(SupplierEmail).where(SupplierEmail.supplier_id == supplier.id))
+                self.db.execute(delete(Supplier).where(Supplier.id == supplier.id))
                 self.db.commit()
                 
                 logging.info(f"Supplier {supplier.company_name} deleted")
@@ -741,6 +760,7 @@ class SuppliersView(QWidget):
                 # Refresh the view
                 self.refresh_data()
             except Exception as e:
+                self.db.rollback()
                 logging.error(f"Error deleting supplier: {str(e)}")
                 QMessageBox.warning(self, "Erreur", f"Une erreur est survenue : {str(e)}")
     
@@ -749,7 +769,8 @@ class SuppliersView(QWidget):
         Open the view supplier dialog in read-only mode using supplier ID.
         """
         try:
-            supplier = self.db.query(Supplier).filter(Supplier.id == supplier_id).first()
+            # Served from the session's identity map when the supplier is already loaded
+            supplier = self.db.get(Supplier, supplier_id)
             if supplier:
                 self.view_supplier(supplier)
             else:
@@ -763,7 +784,8 @@ class SuppliersView(QWidget):
         Open the edit supplier dialog using supplier ID.
         """
         try:
-            supplier = self.db.query(Supplier).filter(Supplier.id == supplier_id).first()
+            # Served from the session's identity map when the supplier is already loaded
+            supplier = self.db.get(Supplier, supplier_id)
             if supplier:
                 self.edit_supplier(supplier)
             else:
@@ -777,7 +799,8 @@ class SuppliersView(QWidget):
         Delete a supplier using supplier ID.
         """
         try:
-            supplier = self.db.query(Supplier).filter(Supplier.id == supplier_id).first()
+            # Served from the session's identity map when the supplier is already loaded
+            supplier = self.db.get(Supplier, supplier_id)
             if supplier:
                 self.delete_supplier(supplier)
             else:
@@ -788,129 +811,133 @@ class SuppliersView(QWidget):
     
     def refresh_messages(self):
         """
-        Refresh the messages table.
+        Refresh the messages table, loading the messages on a background thread.
+        """
+        self.messages_request += 1
+        task = MessagesLoadTask(self.messages_request, self)
+        task.signals.loaded.connect(self.messages_loaded)
+        QThreadPool.globalInstance().start(task)
+    
+    def messages_loaded(self, request, emails):
+        """
+        Fill the messages table with the messages loaded by a refresh.
+        
+        Args:
+            request: Number of the refresh that loaded the messages.
+            emails: List of RECENT_MESSAGES rows, or None if they could not be loaded.
         """
+        self.sender().deleteLater()
+        # A later refresh is on its way, or loading failed
+        if request != self.messages_request or emails is None:
+            return
+        
+        # Repaint once after all the rows rather than per change
+        self.messages_table.setUpdatesEnabled(False)
         try:
-            # Get all emails
-            emails = self.db.query(SupplierEmail).order_by(SupplierEmail.received_at.desc()).limit(10).all()
-            
-            # Populate messages table
-            self.messages_table.setRowCount(len(emails))
+            # Populate messages table; the rows are allocated in one go and then filled,
+            # rather than inserted one by one
+            self.messages_model.setRowCount(len(emails))
             
-            # Set row height for better icon visibility
-            for i in range(len(emails)):
-                self.messages_table.setRowHeight(i, 40)
-                
-            for i, email in enumerate(emails):
+            for row, email in enumerate(emails):
                 # Supplier
-                supplier = self.db.query(Supplier).filter(Supplier.id == email.supplier_id).first()
-                supplier_name = supplier.company_name if supplier else "Inconnu"
-                supplier_item = QTableWidgetItem(supplier_name)
-                
-                # Make unread emails bold
-                if email.status == EmailStatus.UNREAD:
-                    font = supplier_item.font()
-                    font.setBold(True)
-                    supplier_item.setFont(font)
-                
-                self.messages_table.setItem(i, 0, supplier_item)
+                supplier_item = QStandardItem(email.company_name or "Inconnu")
+                supplier_item.setData(email.supplier_id, Qt.UserRole)
                 
                 # Subject
-                subject_item = QTableWidgetItem(email.subject)
+                subject_item = QStandardItem(email.subject)
                 
                 # Make unread emails bold
                 if email.status == EmailStatus.UNREAD:
-                    font = subject_item.font()
-                    font.setBold(True)
-                    subject_item.setFont(font)
-                
-                self.messages_table.setItem(i, 1, subject_item)
+                    supplier_item.setFont(self.unread_font)
+                    subject_item.setFont(self.unread_font)
                 
                 # Date
-                date_item = QTableWidgetItem(email.received_at.strftime("%d %b %Y %H:%M"))
-                self.messages_table.setItem(i, 2, date_item)
+                date_item = QStandardItem(email.received_at.strftime("%d %b %Y %H:%M"))
                 
                 # Status
-                status_text = email.status.value.capitalize()
-                if email.status == EmailStatus.UNREAD:
-                    status_text = "Nouveau"
-                
-                status_item = QTableWidgetItem(status_text)
-                self.messages_table.setItem(i, 3, status_item)
+                status_item = QStandardItem(MESSAGE_STATUS_TEXTS[email.status])
                 
-                # Actions
-                actions_widget = QWidget()
-                actions_layout = QHBoxLayout(actions_widget)
-                actions_layout.setContentsMargins(5, 0, 5, 0)
-                actions_layout.setSpacing(5)
+                # Actions, identified by the email ID
+                actions_item = QStandardItem()
+                actions_item.setData(email.id, Qt.UserRole)
                 
-                # Create a fixed copy of the email for this row
-                email_id = email.id
-                
-                # View button
-                view_btn = QPushButton()
-                view_btn.setIcon(QIcon("src/resources/icons/view.png"))
-                view_btn.setIconSize(QSize(16, 16))
-                view_btn.setFixedSize(30, 30)
-                view_btn.setStyleSheet("""
-                    QPushButton {
-                        background-color: #334155;
-                        border-radius: 15px;
-                        border: none;
-                    }
-                    QPushButton:hover {
-                        background-color: #475569;
-                    }
-                """)
-                view_btn.setToolTip("Voir le message")
-                view_btn.clicked.connect(lambda checked=False, id=email_id: self.view_message(id))
-                
-                # Reply button
-                reply_btn = QPushButton()
-                reply_btn.setIcon(QIcon("src/resources/icons/reply.png"))
-                reply_btn.setIconSize(QSize(16, 16))
-                reply_btn.setFixedSize(30, 30)
-                reply_btn.setStyleSheet("""
-                    QPushButton {
-                        background-color: #334155;
-                        border-radius: 15px;
-                        border: none;
-                    }
-                    QPushButton:hover {
-                        background-color: #475569;
-                    }
-                """)
-                reply_btn.setToolTip("Répondre")
-                reply_btn.clicked.connect(lambda checked=False, id=email_id: self.reply_to_message(id))
-                
-                # Delete button
-                delete_btn = QPushButton()
-                delete_btn.setIcon(QIcon("src/resources/icons/delete.png"))
-                delete_btn.setIconSize(QSize(16, 16))
-                delete_btn.setFixedSize(30, 30)
-                delete_btn.setStyleSheet("""
-                    QPushButton {
-                        background-color: #334155;
-                        border-radius: 15px;
-                        border: none;
-                    }
-                    QPushButton:hover {
-                        background-color: #475569;
-                    }
-                """)
-                delete_btn.setToolTip("Supprimer")
-                delete_btn.clicked.connect(lambda checked=False, id=email_id: self.delete_message(id))
-                
-                actions_layout.addWidget(view_btn)
-                actions_layout.addWidget(reply_btn)
-                actions_layout.addWidget(delete_btn)
-                actions_layout.addStretch()
-                
-                self.messages_table.setCellWidget(i, 4, actions_widget)
+                for column, item in enumerate((supplier_item, subject_item, date_item, status_item, actions_item)):
+                    self.messages_model.setItem(row, column, item)
             
             logging.info("Messages refreshed")
         except Exception as e:
             logging.error(f"Error refreshing messages: {str(e)}")
+        finally:
+            self.messages_table.setUpdatesEnabled(True)
+    
+    def message_row(self, email_id):
+        """
+        Return the row of an email in the messages table, or None if it is not listed.
+        
+        Args:
+            email_id: ID of the email.
+        """
+        matches = self.messages_model.match(
+            self.messages_model.index(0, 4), Qt.UserRole, email_id, 1, Qt.MatchExactly
+        )
+        return matches[0].row() if matches else None
+    
+    def mark_message_read(self, email_id):
+        """
+        Show an email's row in the messages table as read.
+        
+        Args:
+            email_id: ID of the email.
+        """
+        row = self.message_row(email_id)
+        if row is None:
+            return
+        
+        self.messages_model.item(row, 0).setData(None, Qt.FontRole)
+        self.messages_model.item(row, 1).setData(None, Qt.FontRole)
+        self.messages_model.item(row, 3).setText(MESSAGE_STATUS_TEXTS[EmailStatus.READ])
+    
+    def prefetch_message_supplier(self, index, *args):
+        """
+        Fetch the supplier of a message on a background thread, before it is opened.
+        
+        Args:
+            index: Model index of the hovered or selected cell.
+        """
+        if not index.isValid():
+            return
+        
+        supplier_id = self.messages_model.index(index.row(), 0).data(Qt.UserRole)
+        if (supplier_id is None or supplier_id in self.prefetched_suppliers
+                or supplier_id in self.pending_supplier_lookups):
+            return
+        
+        self.pending_supplier_lookups.add(supplier_id)
+        task = SupplierLookupTask(supplier_id, self)
+        task.signals.found.connect(self.supplier_prefetched)
+        QThreadPool.globalInstance().start(task)
+    
+    def supplier_prefetched(self, supplier_id, supplier):
+        """
+        Keep a supplier fetched ahead of opening one of its messages.
+        """
+        self.sender().deleteLater()
+        self.pending_supplier_lookups.discard(supplier_id)
+        if supplier is not None:
+            self.prefetched_suppliers[supplier_id] = supplier
+    
+    def compose_form(self, reply_to=None, supplier=None):
+        """
+        Return the compose dialog, cleared for a new email or a reply.
+        
+        Args:
+            reply_to: Optional email being replied to.
+            supplier: Optional supplier to pre-fill the recipient field.
+        """
+        if self.compose_dialog is None:
+            self.compose_dialog = SupplierEmailComposeDialog(parent=self)
+        self.compose_dialog.reset(reply_to=reply_to, supplier=supplier)
+        return self.compose_dialog
     
     def compose_email(self, supplier=None):
         """
@@ -919,7 +946,7 @@ class SuppliersView(QWidget):
         Args:
             supplier: Optional supplier to pre-fill the recipient field.
         """
-        dialog = SupplierEmailComposeDialog(parent=self, supplier=supplier)
+        dialog = self.compose_form(supplier=supplier)
         if dialog.exec():
             # Refresh the view to show the new email
             self.refresh_messages()
@@ -932,12 +959,30 @@ class SuppliersView(QWidget):
             email_id: ID of the email to view.
         """
         try:
-            email = self.db.query(SupplierEmail).filter(SupplierEmail.id == email_id).first()
+            # Served from the session's identity map when the email is already loaded
+            email = self.db.get(SupplierEmail, email_id)
             if email:
-                dialog = SupplierEmailViewDialog(email, self)
-                if dialog.exec():
-                    # Refresh the view to show updated status
+                # The dialog marks an unread incoming email as read
+                marked_read = email.is_incoming and email.status == EmailStatus.UNREAD
+                
+                # The dialog replies through the compose dialog this view reuses
+                dialog = SupplierEmailViewDialog(
+                    email, self, supplier=self.prefetched_suppliers.get(email.supplier_id),
+                    compose_form=self.compose_form
+                )
+                dialog.exec()
+                
+                if marked_read:
+                    # The dialog updated the status through its own session, so the copy
+                    # held by this session is reloaded on its next use
+                    self.db.expire(email, ["status"])
+                
+                if dialog.reply_sent:
+                    # Reload the table to show the reply
                     self.refresh_messages()
+                elif marked_read:
+                    # Show the updated status on the message's row, without reloading the table
+                    self.mark_message_read(email_id)
             else:
                 QMessageBox.warning(self, "Erreur", "Message non trouvé.")
         except Exception as e:
@@ -952,15 +997,12 @@ class SuppliersView(QWidget):
             email_id: ID of the email to reply to.
         """
         try:
-            email = self.db.query(SupplierEmail).filter(SupplierEmail.id == email_id).first()
+            # Served from the session's identity map when the email is already loaded
+            email = self.db.get(SupplierEmail, email_id)
             if email:
-                supplier = self.db.query(Supplier).filter(Supplier.id == email.supplier_id).first()
+                supplier = self.db.get(Supplier, email.supplier_id)
                 if supplier:
-                    dialog = SupplierEmailComposeDialog(
-                        parent=self,
-                        reply_to=email,
-                        supplier=supplier
-                    )
+                    dialog = self.compose_form(reply_to=email, supplier=supplier)
                     if dialog.exec():
                         # Refresh the view to show the new email
                         self.refresh_messages()
@@ -979,26 +1021,32 @@ class SuppliersView(QWidget):
         Args:
             email_id: ID of the email to delete.
         """
+        # Confirm deletion
+        reply = QMessageBox.question(
+            self, "Confirmer la suppression", 
+            "Êtes-vous sûr de vouloir supprimer ce message ?",
+            QMessageBox.Yes | QMessageBox.No, QMessageBox.No
+        )
+        
+        if reply != QMessageBox.Yes:
+            return
+        
         try:
-            email = self.db.query(SupplierEmail).filter(SupplierEmail.id == email_id).first()
-            if email:
-                # Confirm deletion
-                reply = QMessageBox.question(
-                    self, "Confirmer la suppression", 
-                    "Êtes-vous sûr de vouloir supprimer ce message ?",
-                    QMessageBox.Yes | QMessageBox.No, QMessageBox.No
-                )
+            # A single DELETE, without loading the email first; its row count
+            # tells whether the email still existed
+            result = self.db.execute(delete(SupplierEmail).where(SupplierEmail.id == email_id))
+            self.db.commit()
+            
+            if result.rowcount:
+                logging.info(f"Message {email_id} deleted")
                 
-                if reply == QMessageBox.Yes:
-                    self.db.query(SupplierEmail).filter(SupplierEmail.id == email_id).delete()
-                    self.db.commit()
-                    
-                    logging.info(f"Message deleted: {email.subject}")
-                    
-                    # Refresh the view
-                    self.refresh_messages()
+                # Remove the message's row, without reloading the table
+                row = self.message_row(email_id)
+                if row is not None:
+                    self.messages_model.removeRow(row)
             else:
                 QMessageBox.warning(self, "Erreur", "Message non trouvé.")
         except Exception as e:
+            self.db.rollback()
             logging.error(f"Error deleting message: {str(e)}")
             QMessageBox.warning(self, "Erreur", f"Une erreur est survenue : {str(e)}")